@@ -0,0 +1,48 @@
+"""Tests for pitched_data.py"""
+
+import unittest
+
+import numpy as np
+
+from modules.Pitcher.pitched_data import PitchedData
+
+
+class PitchedDataTest(unittest.TestCase):
+    def test_from_matrix_exposes_column_views(self):
+        # Arrange
+        matrix = np.array([[0.0, 440.0, 0.9], [0.1, 493.88, 0.85]])
+
+        # Act
+        pitched_data = PitchedData.from_matrix(matrix)
+
+        # Assert
+        self.assertEqual(pitched_data.times.tolist(), [0.0, 0.1])
+        self.assertEqual(pitched_data.frequencies.tolist(), [440.0, 493.88])
+        self.assertEqual(pitched_data.confidence.tolist(), [0.9, 0.85])
+        self.assertIs(pitched_data.times.base, pitched_data.confidence.base)
+
+    def test_to_matrix_does_not_copy_matrix_backed_data(self):
+        # Arrange
+        pitched_data = PitchedData.from_matrix(np.arange(12.0).reshape(4, 3))
+
+        # Act
+        matrix = pitched_data.to_matrix()
+
+        # Assert
+        self.assertEqual(matrix.shape, (4, 3))
+        self.assertTrue(np.shares_memory(matrix, pitched_data.times))
+
+    def test_to_matrix_stacks_list_fields(self):
+        # Arrange
+        pitched_data = PitchedData([0.0, 0.1], [440.0, 493.88], [0.9, 0.85])
+
+        # Act
+        matrix = pitched_data.to_matrix()
+
+        # Assert
+        self.assertEqual(matrix.dtype, np.float64)
+        self.assertEqual(matrix.tolist(), [[0.0, 440.0, 0.9], [0.1, 493.88, 0.85]])
+
+
+if __name__ == "__main__":
+    unittest.main()
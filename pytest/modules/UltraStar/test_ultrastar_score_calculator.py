@@ -0,0 +1,50 @@
+"""Tests for ultrastar_score_calculator.py"""
+
+import tempfile
+import unittest
+
+from modules.Ultrastar.ultrastar_score_calculator import UltrastarScoreCalculator
+
+
+class TestCalculatePitchAccuracyBatch(unittest.TestCase):
+    def setUp(self):
+        cache_folder = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_folder.cleanup)
+        self.calculator = UltrastarScoreCalculator(cache_folder=cache_folder.name)
+
+    def test_batch_matches_single_note_calculation(self):
+        # Arrange
+        target_notes = ["C4", "A4", "C4", "E4", "C4", "not a note"]
+        sung_notes = ["C4", "A#4", "C5", "E4", "unparseable", "C4"]
+
+        # Act
+        is_accurate, accuracy = self.calculator.calculate_pitch_accuracy_batch(target_notes, sung_notes)
+
+        # Assert
+        expected = [self.calculator.calculate_pitch_accuracy(target, sung)
+                    for target, sung in zip(target_notes, sung_notes)]
+        self.assertEqual([(bool(accurate), float(value)) for accurate, value in zip(is_accurate, accuracy)],
+                         expected)
+
+    def test_unparseable_note_is_inaccurate(self):
+        # Act
+        is_accurate, accuracy = self.calculator.calculate_pitch_accuracy_batch(["C4"], ["unparseable"])
+
+        # Assert
+        self.assertEqual((bool(is_accurate[0]), float(accuracy[0])), (False, 0.0))
+
+    def test_tolerance_is_applied(self):
+        # Act
+        is_accurate, _ = self.calculator.calculate_pitch_accuracy_batch(["C4", "C4"], ["C#4", "D4"], tolerance=1.0)
+
+        # Assert
+        self.assertEqual(is_accurate.tolist(), [True, False])
+
+    def test_length_mismatch_raises_value_error(self):
+        # Act and Assert
+        with self.assertRaisesRegex(ValueError, "same length"):
+            self.calculator.calculate_pitch_accuracy_batch(["C4", "D4"], ["C4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,7 @@ from packaging import version
 from unittest.mock import patch, mock_open
 from src.modules.Ultrastar.ultrastar_writer import create_ultrastar_txt, deviation, format_separated_string
 from src.modules.Midi.MidiSegment import MidiSegment
-from src.modules.Ultrastar.ultrastar_txt import UltrastarTxtValue, UltrastarTxtTag
+from src.modules.Ultrastar.ultrastar_txt import UltrastarTxtValue, UltrastarTxtTag, FILE_BUFFER_SIZE
 
 
 class TestCreateUltrastarTxt(unittest.TestCase):
@@ -93,7 +93,7 @@ class TestCreateUltrastarTxt(unittest.TestCase):
         mock_file = self.act(bpm, default_ultrastar_class, midi_segments, ultrastar_file_output)
 
         # Assert the file was opened and is utf-8
-        mock_file.assert_called_once_with(ultrastar_file_output, "w", encoding='utf-8')
+        mock_file.assert_called_once_with(ultrastar_file_output, "w", encoding='utf-8', buffering=FILE_BUFFER_SIZE)
 
         # Assert that expected_calls_default_values were written to the file
         mock_file_handle = mock_file.return_value.__enter__.return_value.write
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Fixtures de arquivos compartilhadas pelos testes de conversão e validação de formatos
+"""
+
+import atexit
+import importlib.util
+import shutil
+import struct
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+
+# Header WAV PCM básico (estéreo, 44.1 kHz, 16 bits) seguido de 1000 bytes de silêncio,
+# montado direto em um único buffer pré-alocado
+_WAV_HEADER_FORMAT = '<4sI4s4sIHHIIHH4sI'
+WAV_FIXTURE = bytearray(struct.calcsize(_WAV_HEADER_FORMAT) + 1000)  # Dados de áudio simulados já zerados
+struct.pack_into(
+    _WAV_HEADER_FORMAT, WAV_FIXTURE, 0,
+    b'RIFF', 1000, b'WAVE',  # ChunkID, ChunkSize, Format
+    b'fmt ', 16, 1, 2,  # Subchunk1ID, Subchunk1Size, AudioFormat (PCM), NumChannels
+    44100, 176400, 4, 16,  # SampleRate, ByteRate, BlockAlign, BitsPerSample
+    b'data', 1000,  # Subchunk2ID, Subchunk2Size
+)
+
+ULTRASTAR_FIXTURE = """#TITLE:Test Song
+#ARTIST:Test Artist
+#MP3:test_song.mp3
+#BPM:120
+#LANGUAGE:pt-BR
+#GENRE:Pop
+#YEAR:2023
+: 0 4 60 Test
+: 4 4 62 Song
+E
+"""
+
+# Chave -> (nome do arquivo, conteúdo)
+_FIXTURE_CONTENTS = {
+    'wav': ("test_song.wav", WAV_FIXTURE),
+    'flac': ("test_song.flac", b'fLaC' + b'\x00' * 100),  # Assinatura FLAC + dados simulados
+    'ogg': ("test_song.ogg", b'OggS' + b'\x00' * 100),  # Assinatura OGG + dados simulados
+    'mp3': ("test_song.mp3", b'ID3' + b'\x00' * 100),  # Header MP3 básico
+    'ultrastar': ("test_song.txt", ULTRASTAR_FIXTURE.encode('utf-8')),
+    'invalid_ultrastar': ("invalid_song.txt", b"#TITLE:Invalid Song\n"),  # Faltam tags obrigatórias
+    'unsupported': ("test_song.xyz", "formato não suportado".encode('utf-8')),
+}
+
+
+@lru_cache(maxsize=None)
+def audio_fixture_dir() -> Path:
+    """Criar uma única vez o diretório temporário com todos os arquivos de teste"""
+    temp_dir = Path(tempfile.mkdtemp())
+    atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
+
+    for filename, content in _FIXTURE_CONTENTS.values():
+        (temp_dir / filename).write_bytes(content)
+
+    return temp_dir
+
+
+def audio_fixture_files() -> dict:
+    """Caminhos dos arquivos de teste, indexados pela chave do fixture"""
+    temp_dir = audio_fixture_dir()
+    return {key: str(temp_dir / filename) for key, (filename, _) in _FIXTURE_CONTENTS.items()}
+
+
+def run_pytest(test_file, extra_args=(), xdist_args=()):
+    """Executar um arquivo de teste com pytest, repassando os argumentos da linha de comando
+
+    extra_args entram sempre; xdist_args só quando o pytest-xdist estiver instalado,
+    junto com -n auto para rodar os testes em paralelo.
+    """
+    # --fail-fast interrompe na primeira falha (equivale ao -x do pytest)
+    args = [test_file, "-q", *extra_args, *("-x" if arg == "--fail-fast" else arg for arg in sys.argv[1:])]
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto", *xdist_args]
+    return pytest.main(args)
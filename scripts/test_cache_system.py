@@ -9,6 +9,7 @@ import json
 import time
 import tempfile
 import shutil
+import multiprocessing
 from pathlib import Path
 
 # Adicionar o diretório src ao path
@@ -24,12 +25,22 @@ from modules.ProcessData import MediaInfo
 from modules.Midi.MidiSegment import MidiSegment
 import numpy as np
 
+def _count_suffix(directory, suffix):
+    """Contar arquivos com o sufixo informado sem materializar a listagem"""
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(suffix))
+
+def _suffix_mtimes(directory, suffix):
+    """Nome -> mtime (ns) dos arquivos com o sufixo informado"""
+    with os.scandir(directory) as entries:
+        return {entry.name: entry.stat().st_mtime_ns for entry in entries if entry.name.endswith(suffix)}
+
 def test_pitch_cache():
     """Testar sistema de cache de pitch detection"""
     print("\n=== Testando Sistema de Cache de Pitch ===")
     
     with tempfile.TemporaryDirectory() as temp_dir:
-        cache_path = os.path.join(temp_dir, "pitch_cache.json")
+        cache_path = os.path.join(temp_dir, "pitch_cache.npz")
         
         # Criar dados de pitch de teste
         print("1. Criando dados de pitch de teste...")
@@ -61,18 +72,46 @@ def test_pitch_cache():
         if loaded_data:
             print(f"✓ Cache carregado com sucesso ({load_time:.3f}s)")
             
-            # Verificar integridade dos dados
-            if (np.array_equal(loaded_data.times, pitched_data.times) and
-                np.array_equal(loaded_data.frequencies, pitched_data.frequencies) and
-                np.array_equal(loaded_data.confidence, pitched_data.confidence)):
+            # Verificar integridade dos dados (o cache quantiza: float32/float16/uint8)
+            # Uma única comparação sobre a matriz (N, 3), com tolerância por coluna
+            within_tolerance = np.allclose(
+                loaded_data.to_matrix(), pitched_data.to_matrix(),
+                rtol=np.array([0.0, 1e-3, 0.0]), atol=np.array([1e-6, 0.0, 0.5 / 255])
+            )
+            
+            # Já quantizados, os dados devem sobreviver a um novo ciclo byte a byte (memcmp)
+            resaved_path = os.path.join(temp_dir, "pitch_cache_resaved.npz")
+            save_pitch_cache(resaved_path, loaded_data)
+            reloaded_data = load_pitch_cache(resaved_path)
+            stable_round_trip = (reloaded_data is not None and
+                                 reloaded_data.to_matrix().tobytes() == loaded_data.to_matrix().tobytes())
+            
+            if within_tolerance and stable_round_trip:
                 print("✓ Integridade dos dados verificada")
-                return True
             else:
                 print("✗ Dados corrompidos no cache")
                 return False
         else:
             print("✗ Falha ao carregar cache")
             return False
+        
+        # Testar invalidação pelo mtime/tamanho do áudio de origem
+        print("4. Testando invalidação do cache pelo áudio de origem...")
+        source_audio = os.path.join(temp_dir, "source.wav")
+        Path(source_audio).write_bytes(b"RIFF")
+        save_pitch_cache(cache_path, pitched_data, source=source_audio)
+        
+        if load_pitch_cache(cache_path, source=source_audio) is None:
+            print("✗ Cache descartado mesmo com o áudio inalterado")
+            return False
+        print("✓ Cache reutilizado com o áudio inalterado")
+        
+        Path(source_audio).write_bytes(b"RIFF-changed")
+        if load_pitch_cache(cache_path, source=source_audio) is not None:
+            print("✗ Cache reutilizado mesmo com o áudio alterado")
+            return False
+        print("✓ Cache invalidado após alteração do áudio")
+        return True
 
 def test_midi_cache():
     """Testar sistema de cache de MIDI"""
@@ -112,13 +151,34 @@ def test_midi_cache():
             print(f"✓ MIDI criado com cache ({creation_time:.3f}s)")
             
             # Verificar se arquivos de cache foram criados
-            cache_files = [f for f in os.listdir(temp_dir) if f.endswith('.cache')]
-            if cache_files:
-                print(f"✓ Arquivos de cache criados: {len(cache_files)}")
+            cache_files = _count_suffix(temp_dir, '.cache')
+            if not cache_files:
+                print("✗ MIDI criado mas sem arquivo de cache endereçado por conteúdo")
+                return False
+            print(f"✓ Arquivos de cache criados: {cache_files}")
+            
+            # Segunda chamada com os mesmos segmentos (outro nome) deve reutilizar o cache
+            print("2. Testando reutilização do cache com segmentos idênticos...")
+            cache_mtimes = _suffix_mtimes(temp_dir, '.mid.cache')
+            cached_result = midi_creator.create_enhanced_midi_file(
+                real_bpm=media_info.bpm,
+                song_output=temp_dir,
+                midi_segments=midi_segments,
+                basename_without_ext="test_cached_again",
+                metadata={"use_cache": True}
+            )
+            
+            # Reutilizado = nenhum arquivo de cache novo ou regravado
+            metadata_file = Path(temp_dir) / "midi_metadata.json"
+            metadata_paths = [entry["output_path"] for entry in json.loads(metadata_file.read_text(encoding='utf-8'))]
+            if (cached_result and _suffix_mtimes(temp_dir, '.mid.cache') == cache_mtimes
+                    and Path(cached_result).read_bytes() == Path(result).read_bytes()
+                    and cached_result in metadata_paths):
+                print("✓ Cache reutilizado, com metadados para o novo arquivo")
                 return True
             else:
-                print("⚠ MIDI criado mas sem arquivos de cache específicos")
-                return True
+                print("✗ Segmentos idênticos não reutilizaram o cache de MIDI")
+                return False
         else:
             print("✗ Falha na criação de MIDI com cache")
             return False
@@ -161,9 +221,9 @@ def test_sheet_cache():
                 print(f"✓ Partitura criada com cache ({creation_time:.3f}s)")
                 
                 # Verificar metadados de cache
-                cache_files = [f for f in os.listdir(temp_dir) if f.endswith('.json')]
+                cache_files = _count_suffix(temp_dir, '.json')
                 if cache_files:
-                    print(f"✓ Metadados de cache salvos: {len(cache_files)} arquivos")
+                    print(f"✓ Metadados de cache salvos: {cache_files} arquivos")
                     return True
                 else:
                     print("⚠ Partitura criada mas sem metadados de cache")
@@ -212,15 +272,27 @@ def test_ultrastar_cache():
         output_file = os.path.join(temp_dir, "test_cache.txt")
         
         start_time = time.time()
-        writer.save_metadata(ultrastar_data, output_file)
+        cold_written = writer.save_metadata(ultrastar_data, output_file)
         save_time = time.time() - start_time
         
         print(f"✓ Metadados salvos ({save_time:.3f}s)")
         
+        # Segunda gravação com o mesmo conteúdo deve ser ignorada pelo hash
+        print("2. Testando gravação repetida com o mesmo conteúdo...")
+        start_time = time.time()
+        warm_written = writer.save_metadata(ultrastar_data, output_file)
+        warm_time = time.time() - start_time
+        
+        if cold_written and not warm_written:
+            print(f"✓ Gravação repetida ignorada ({warm_time:.3f}s)")
+        else:
+            print("✗ Hash de conteúdo não evitou a regravação dos metadados")
+            return False
+        
         # Verificar arquivos de cache
-        cache_files = [f for f in os.listdir(temp_dir) if f.endswith('.json')]
+        cache_files = _count_suffix(temp_dir, '.json')
         if cache_files:
-            print(f"✓ Arquivos de metadados criados: {len(cache_files)}")
+            print(f"✓ Arquivos de metadados criados: {cache_files}")
             return True
         else:
             print("⚠ Metadados processados mas sem arquivos de cache específicos")
@@ -263,26 +335,23 @@ def test_performance_optimizations():
     # Testar processamento em lote
     print("1. Testando processamento em lote...")
     
-    # Criar múltiplos segmentos para teste
-    large_segments = []
-    for i in range(100):
-        note = f"C{4 + (i % 3)}"  # C4, C5, C6
-        start = i * 0.1
-        end = start + 0.1
-        word = f"word{i}"
-        large_segments.append(MidiSegment(note, start, end, word))
+    # Criar múltiplos segmentos para teste a partir de arrays alinhados (C4, C5, C6)
+    segment_count = 100
+    indices = np.arange(segment_count)
+    notes = np.array(["C4", "C5", "C6"])[indices % 3]
+    starts = indices * 0.1
+    ends = starts + 0.1
+    words = np.char.add("word", indices.astype(str))
+    large_segments = MidiSegment.from_arrays(notes, starts, ends, words)
     
     # Testar processamento
     start_time = time.time()
     
-    # Simular processamento otimizado
-    processed_count = 0
+    # Simular processamento otimizado: os lotes são fatias dos arrays, sem iteração em Python
     batch_size = 10
-    
-    for i in range(0, len(large_segments), batch_size):
-        batch = large_segments[i:i+batch_size]
-        # Simular processamento do lote
-        processed_count += len(batch)
+    processed_count = sum(
+        len(large_segments[i:i + batch_size]) for i in range(0, segment_count, batch_size)
+    )
     
     processing_time = time.time() - start_time
     
@@ -324,8 +393,31 @@ def test_memory_optimization():
         print(f"⚠ Erro na estimativa de memória: {e}")
         return True  # Não é crítico
 
+def _run_test(test):
+    """Executar um teste em um processo do pool e retornar (nome, resultado)"""
+    test_name, test_func = test
+    try:
+        print(f"\n{'='*20} {test_name} {'='*20}")
+        result = bool(test_func())
+        
+        if result:
+            print(f"✅ {test_name}: PASSOU")
+        else:
+            print(f"❌ {test_name}: FALHOU")
+            
+    except Exception as e:
+        print(f"💥 ERRO GERAL NO TESTE {test_name}: {e}")
+        result = False
+    
+    sys.stdout.flush()
+    return test_name, result
+
 def main():
     """Executar todos os testes de cache e performance"""
+    # Saída com buffer de bloco: um flush por teste em vez de um write por print()
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    
     print("🚀 TESTE COMPLETO DO SISTEMA DE CACHE E PERFORMANCE 🚀")
     print("=" * 60)
     
@@ -339,22 +431,9 @@ def main():
         ("Otimizações de Memória", test_memory_optimization)
     ]
     
-    results = []
-    
-    for test_name, test_func in tests:
-        try:
-            print(f"\n{'='*20} {test_name} {'='*20}")
-            result = test_func()
-            results.append((test_name, result))
-            
-            if result:
-                print(f"✅ {test_name}: PASSOU")
-            else:
-                print(f"❌ {test_name}: FALHOU")
-                
-        except Exception as e:
-            print(f"💥 ERRO GERAL NO TESTE {test_name}: {e}")
-            results.append((test_name, False))
+    # Cada teste usa seu próprio diretório temporário, então podem rodar em paralelo
+    with multiprocessing.Pool(processes=min(len(tests), os.cpu_count() or 1)) as pool:
+        results = pool.map(_run_test, tests)
     
     # Resumo final
     print("\n" + "="*60)
@@ -3,10 +3,15 @@
 Teste completo das opções de linha de comando do UltraSinger
 """
 
+import io
 import os
+import re
 import sys
+import threading
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Adicionar o diretório src ao path
@@ -14,14 +19,36 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from modules.console_colors import ULTRASINGER_HEAD, green_highlighted, red_highlighted, blue_highlighted
 
+@lru_cache(maxsize=None)
+def get_help_output():
+    """Executar --help uma única vez e reutilizar a saída em todos os testes"""
+    return subprocess.run([
+        sys.executable, "src/UltraSinger.py", "--help"
+    ], capture_output=True, text=True, timeout=30)
+
+def has_option(option, help_output):
+    """Verificar se a flag aparece inteira na ajuda (--whisper não casa com --whisper_batch_size)"""
+    return re.search(rf'(?<![\w-]){re.escape(option)}(?![\w-])', help_output) is not None
+
+class ThreadBufferedStdout:
+    """stdout que envia a saída de cada thread para o seu próprio buffer, quando houver um"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        return getattr(self.local, 'buffer', self.stream).write(text)
+
+    def flush(self):
+        getattr(self.local, 'buffer', self.stream).flush()
+
 def test_help_option():
     """Testar opção de ajuda"""
     print(f"\n{ULTRASINGER_HEAD} Testando opção --help...")
     
     try:
-        result = subprocess.run([
-            sys.executable, "src/UltraSinger.py", "--help"
-        ], capture_output=True, text=True, timeout=10)
+        result = get_help_output()
         
         if result.returncode == 0 and "UltraSinger.py" in result.stdout:
             print(f"✓ {green_highlighted('Opção --help funcionando')}")
@@ -60,8 +87,7 @@ def test_input_output_options():
     with tempfile.TemporaryDirectory() as temp_dir:
         # Criar arquivo de áudio de teste (vazio para teste)
         test_audio = os.path.join(temp_dir, "test.mp3")
-        with open(test_audio, 'w') as f:
-            f.write("")  # Arquivo vazio para teste
+        Path(test_audio).touch()  # Arquivo vazio para teste
         
         output_dir = os.path.join(temp_dir, "output")
         
@@ -95,14 +121,15 @@ def test_model_options():
     passed = 0
     total = len(test_cases)
     
+    try:
+        help_output = get_help_output().stdout
+    except Exception as e:
+        print(f"✗ {red_highlighted(f'Erro ao executar --help: {e}')}")
+        return False
+    
     for option, value in test_cases:
         try:
-            result = subprocess.run([
-                sys.executable, "src/UltraSinger.py",
-                "--help"  # Usar help para testar se as opções são reconhecidas
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
+            if has_option(option, help_output):
                 print(f"✓ {green_highlighted(f'Opção {option} reconhecida')}")
                 passed += 1
             else:
@@ -135,15 +162,15 @@ def test_boolean_flags():
     passed = 0
     total = len(boolean_flags)
     
+    try:
+        help_output = get_help_output().stdout
+    except Exception as e:
+        print(f"✗ {red_highlighted(f'Erro ao executar --help: {e}')}")
+        return False
+    
     for flag in boolean_flags:
         try:
-            # Testar se a flag é reconhecida (usando help)
-            result = subprocess.run([
-                sys.executable, "src/UltraSinger.py",
-                "--help"
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
+            if has_option(flag, help_output):
                 print(f"✓ {green_highlighted(f'Flag {flag} reconhecida')}")
                 passed += 1
             else:
@@ -163,15 +190,15 @@ def test_format_version_option():
     passed = 0
     total = len(format_versions)
     
+    try:
+        help_output = get_help_output().stdout
+    except Exception as e:
+        print(f"✗ {red_highlighted(f'Erro ao executar --help: {e}')}")
+        return False
+    
     for version in format_versions:
         try:
-            # Testar com help para verificar se a opção é reconhecida
-            result = subprocess.run([
-                sys.executable, "src/UltraSinger.py",
-                "--help"
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
+            if has_option("--format_version", help_output) and version in help_output:
                 print(f"✓ {green_highlighted(f'Versão de formato {version} suportada')}")
                 passed += 1
             else:
@@ -195,14 +222,15 @@ def test_path_options():
     passed = 0
     total = len(path_options)
     
+    try:
+        help_output = get_help_output().stdout
+    except Exception as e:
+        print(f"✗ {red_highlighted(f'Erro ao executar --help: {e}')}")
+        return False
+    
     for option, path in path_options:
         try:
-            result = subprocess.run([
-                sys.executable, "src/UltraSinger.py",
-                "--help"
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
+            if has_option(option, help_output):
                 print(f"✓ {green_highlighted(f'Opção {option} reconhecida')}")
                 passed += 1
             else:
@@ -225,14 +253,15 @@ def test_numeric_options():
     passed = 0
     total = len(numeric_options)
     
+    try:
+        help_output = get_help_output().stdout
+    except Exception as e:
+        print(f"✗ {red_highlighted(f'Erro ao executar --help: {e}')}")
+        return False
+    
     for option, value in numeric_options:
         try:
-            result = subprocess.run([
-                sys.executable, "src/UltraSinger.py",
-                "--help"
-            ], capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
+            if has_option(option, help_output):
                 print(f"✓ {green_highlighted(f'Opção {option} reconhecida')}")
                 passed += 1
             else:
@@ -243,6 +272,18 @@ def test_numeric_options():
     
     return passed == total
 
+def run_test(test):
+    """Executar um teste e retornar (nome, resultado ou exceção, saída acumulada)"""
+    test_name, test_func = test
+    # Cada thread escreve no próprio buffer para a saída não se intercalar
+    buffer = sys.stdout.local.buffer = io.StringIO()
+    try:
+        return test_name, bool(test_func()), buffer.getvalue()
+    except Exception as e:
+        return test_name, e, buffer.getvalue()
+    finally:
+        del sys.stdout.local.buffer
+
 def main():
     """Função principal de teste"""
     print(f"{ULTRASINGER_HEAD} {blue_highlighted('=== TESTE COMPLETO DAS OPÇÕES DE LINHA DE COMANDO ===')}")
@@ -258,29 +299,46 @@ def main():
         ("Opções Numéricas", test_numeric_options)
     ]
     
-    passed_tests = 0
     total_tests = len(tests)
-    
-    for test_name, test_func in tests:
+
+    # Cada teste dispara processos independentes do UltraSinger; subprocess.run
+    # libera o GIL enquanto espera, então threads sobrepõem o tempo de startup
+    max_workers = min(8, os.cpu_count() or 1)
+    try:
+        # Preencher o cache de --help antes de abrir as threads
+        get_help_output()
+    except Exception:
+        pass  # Cada teste reporta a falha do --help individualmente
+    original_stdout = sys.stdout
+    sys.stdout = ThreadBufferedStdout(original_stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run_test, tests))
+    finally:
+        sys.stdout = original_stdout
+
+    # Imprimir cada teste na ordem original, com o cabeçalho junto da sua saída
+    for test_name, result, output in results:
         print(f"\n{'='*60}")
         print(f"{ULTRASINGER_HEAD} {blue_highlighted(f'Testando: {test_name}')}")
         print(f"{'='*60}")
-        
-        try:
-            if test_func():
-                print(f"✅ {green_highlighted(f'{test_name}: PASSOU')}")
-                passed_tests += 1
-            else:
-                print(f"❌ {red_highlighted(f'{test_name}: FALHOU')}")
-        except Exception as e:
-            print(f"❌ {red_highlighted(f'{test_name}: ERRO - {e}')}")
-    
+        print(output, end="")
+
+        if result is True:
+            print(f"✅ {green_highlighted(f'{test_name}: PASSOU')}")
+        elif result is False:
+            print(f"❌ {red_highlighted(f'{test_name}: FALHOU')}")
+        else:
+            print(f"❌ {red_highlighted(f'{test_name}: ERRO - {result}')}")
+
+    passed_tests = sum(1 for _, result, _ in results if result is True)
+
     print(f"\n{'='*60}")
     print(f"{ULTRASINGER_HEAD} {blue_highlighted('RESUMO DOS TESTES')}")
     print(f"{'='*60}")
     
-    for i, (test_name, _) in enumerate(tests):
-        status = "✅ PASSOU" if i < passed_tests else "❌ FALHOU"
+    for test_name, result, _ in results:
+        status = "✅ PASSOU" if result is True else "❌ FALHOU"
         print(f"{test_name:.<30} {status}")
     
     print(f"\n{ULTRASINGER_HEAD} Resultado Final: {passed_tests}/{total_tests} testes passaram")
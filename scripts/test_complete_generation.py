@@ -5,25 +5,38 @@ Teste completo da geração de arquivos UltraStar.txt, MIDI e partituras
 
 import os
 import sys
-import tempfile
-import shutil
+from itertools import islice
 from pathlib import Path
 
+import numpy as np
+import pytest
+
 # Adicionar o diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from _fixtures import run_pytest
 from modules.Midi.MidiSegment import MidiSegment
 from modules.Midi.midi_creator import MidiCreator, create_midi_file
 from modules.sheet import SheetMusicCreator, create_sheet
 from modules.Ultrastar.ultrastar_writer import UltraStarWriter
 from modules.ProcessData import MediaInfo
-from modules.Ultrastar.ultrastar_txt import UltrastarTxtValue, UltrastarNoteLine, UltrastarTxtTag, UltrastarTxtNoteTypeTag
+from modules.Ultrastar.ultrastar_txt import UltrastarTxtValue, UltrastarNoteLine, UltrastarTxtTag, UltrastarTxtNoteTypeTag, FILE_BUFFER_SIZE
+
+def file_size_or_none(path):
+    """Tamanho do arquivo com um único stat, ou None se ele não existir"""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
 
 def create_test_data():
-    """Criar dados de teste para simulação"""
+    """Criar dados de teste para simulação
+    
+    Os segmentos são devolvidos como tupla para não serem alterados pelos testes.
+    """
     
     # Criar segmentos MIDI de teste
-    midi_segments = [
+    midi_segments = (
         MidiSegment("C4", 0.0, 1.0, "Hello"),
         MidiSegment("D4", 1.0, 2.0, "world"),
         MidiSegment("E4", 2.0, 3.0, "this"),
@@ -34,7 +47,7 @@ def create_test_data():
         MidiSegment("C5", 7.0, 8.0, "for"),
         MidiSegment("B4", 8.0, 9.0, "Ultra"),
         MidiSegment("A4", 9.0, 10.0, "Singer")
-    ]
+    )
     
     # Criar informações de mídia de teste
     media_info = MediaInfo(
@@ -49,6 +62,9 @@ def create_test_data():
     
     return midi_segments, media_info
 
+# Uma oitava a partir de C4, repetida pelo np.resize sem divisões por elemento
+_PITCH_PATTERN = np.arange(12, dtype=np.int8) + 60
+
 def create_ultrastar_txt_data(midi_segments, media_info):
     """Criar dados UltraStar.txt de teste"""
     
@@ -63,289 +79,199 @@ def create_ultrastar_txt_data(midi_segments, media_info):
     ultrastar_data.creator = "UltraSinger Test"
     ultrastar_data.comment = "Arquivo de teste gerado automaticamente"
     
-    # Adicionar linhas de notas
-    ultrastar_data.UltrastarNoteLines = []
-    for i, segment in enumerate(midi_segments):
-        note_line = UltrastarNoteLine(
-            startBeat=segment.start * 4,  # Converter para beats
-            startTime=segment.start,
-            endTime=segment.end,
-            duration=(segment.end - segment.start) * 4,
-            pitch=60 + (i % 12),  # Pitch MIDI simples
+    # Adicionar linhas de notas (aritmética feita de uma vez sobre arrays)
+    count = len(midi_segments)
+    starts = np.fromiter((segment.start for segment in midi_segments), dtype=np.float64, count=count)
+    ends = np.fromiter((segment.end for segment in midi_segments), dtype=np.float64, count=count)
+    start_beats = starts * 4.0  # Converter para beats
+    duration_beats = (ends - starts) * 4.0
+    pitches = np.resize(_PITCH_PATTERN, count)  # Pitch MIDI simples: a oitava de C4 repetida
+    
+    ultrastar_data.UltrastarNoteLines = [
+        UltrastarNoteLine(
+            startBeat=start_beat,
+            startTime=start,
+            endTime=end,
+            duration=duration,
+            pitch=pitch,
             word=segment.word,
             noteType=UltrastarTxtNoteTypeTag.NORMAL
         )
-        ultrastar_data.UltrastarNoteLines.append(note_line)
+        for start, end, start_beat, duration, pitch, segment in zip(
+            starts.tolist(), ends.tolist(), start_beats.tolist(), duration_beats.tolist(),
+            pitches.tolist(), midi_segments)
+    ]
     
     return ultrastar_data
 
-def test_midi_generation():
-    """Testar geração de arquivos MIDI"""
-    print("=== Testando Geração de MIDI ===")
+@pytest.fixture(scope='session')
+def test_fixtures():
+    """Segmentos MIDI e informações de mídia compartilhados por toda a sessão"""
+    return create_test_data()
+
+def _print_first_lines(output_file):
+    """Mostrar as primeiras linhas de um arquivo UltraStar.txt gerado"""
+    with open(output_file, 'r', encoding='utf-8', buffering=FILE_BUFFER_SIZE) as f:
+        lines = list(islice(f, 10))
+    print("Primeiras linhas:")
+    for line in lines:
+        print(f"  {line.strip()}")
+    return lines
+
+def test_midi_basic(tmp_path, test_fixtures):
+    """Testar geração básica de MIDI"""
+    midi_segments, media_info = test_fixtures
     
-    midi_segments, media_info = create_test_data()
+    create_midi_file(
+        real_bpm=media_info.bpm,
+        song_output=str(tmp_path),
+        midi_segments=midi_segments,
+        basename_without_ext="test_basic"
+    )
     
-    # Criar diretório temporário
-    with tempfile.TemporaryDirectory() as temp_dir:
-        print(f"Diretório temporário: {temp_dir}")
-        
-        # Teste 1: Geração básica de MIDI
-        print("\n1. Testando geração básica de MIDI...")
-        try:
-            create_midi_file(
-                real_bpm=media_info.bpm,
-                song_output=temp_dir,
-                midi_segments=midi_segments,
-                basename_without_ext="test_basic"
-            )
-            
-            midi_file = os.path.join(temp_dir, "test_basic.mid")
-            if os.path.exists(midi_file):
-                size = os.path.getsize(midi_file)
-                print(f"✓ MIDI básico criado com sucesso: {midi_file} ({size} bytes)")
-            else:
-                print("✗ Falha na criação do MIDI básico")
-                
-        except Exception as e:
-            print(f"✗ Erro na geração básica de MIDI: {e}")
-        
-        # Teste 2: Geração avançada de MIDI
-        print("\n2. Testando geração avançada de MIDI...")
-        try:
-            midi_creator = MidiCreator(cache_folder=temp_dir)
-            
-            # Validar dados
-            if midi_creator.validate_midi_data(midi_segments, media_info.bpm):
-                print("✓ Validação de dados MIDI passou")
-                
-                # Estimar propriedades
-                properties = midi_creator.estimate_midi_size(midi_segments)
-                print(f"✓ Propriedades estimadas: {properties}")
-                
-                # Criar MIDI avançado
-                metadata = {
-                    "instrument_program": 0,
-                    "created_by": "UltraSinger Test",
-                    "version": "1.0"
-                }
-                
-                result = midi_creator.create_enhanced_midi_file(
-                    real_bpm=media_info.bpm,
-                    song_output=temp_dir,
-                    midi_segments=midi_segments,
-                    basename_without_ext="test_enhanced",
-                    metadata=metadata
-                )
-                
-                if result:
-                    size = os.path.getsize(result)
-                    print(f"✓ MIDI avançado criado com sucesso: {result} ({size} bytes)")
-                else:
-                    print("✗ Falha na criação do MIDI avançado")
-            else:
-                print("✗ Validação de dados MIDI falhou:")
-                for error in midi_creator.get_validation_errors():
-                    print(f"  - {error}")
-                    
-        except Exception as e:
-            print(f"✗ Erro na geração avançada de MIDI: {e}")
+    midi_file = os.path.join(tmp_path, "test_basic.mid")
+    size = file_size_or_none(midi_file)
+    assert size, "Falha na criação do MIDI básico"
+    print(f"✓ MIDI básico criado com sucesso: {midi_file} ({size} bytes)")
 
-def test_sheet_generation():
-    """Testar geração de partituras"""
-    print("\n=== Testando Geração de Partituras ===")
+def test_midi_enhanced(tmp_path, test_fixtures):
+    """Testar geração avançada de MIDI"""
+    midi_segments, media_info = test_fixtures
+    midi_creator = MidiCreator(cache_folder=str(tmp_path))
     
-    midi_segments, media_info = create_test_data()
+    # Validar dados
+    assert midi_creator.validate_midi_data(midi_segments, media_info.bpm), midi_creator.get_validation_errors()
     
-    # Criar diretório temporário
-    with tempfile.TemporaryDirectory() as temp_dir:
-        cache_dir = os.path.join(temp_dir, "cache")
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        print(f"Diretório temporário: {temp_dir}")
-        print(f"Diretório de cache: {cache_dir}")
-        
-        # Teste 1: Verificar se MuseScore está disponível
-        print("\n1. Verificando disponibilidade do MuseScore...")
-        from modules.sheet import find_musescore_version_in_path
-        
-        version = find_musescore_version_in_path('C:\\Program Files')
-        if version != -1:
-            print(f"✓ MuseScore versão {version} encontrado")
-            
-            # Teste 2: Geração básica de partitura
-            print("\n2. Testando geração básica de partitura...")
-            try:
-                create_sheet(
-                    midi_segments=midi_segments,
-                    output_folder_path=temp_dir,
-                    cache_folder_path=cache_dir,
-                    musescore_path=None,  # Auto-detectar
-                    filename="test_basic_sheet",
-                    media_info=media_info
-                )
-                
-                pdf_file = os.path.join(temp_dir, "test_basic_sheet.pdf")
-                if os.path.exists(pdf_file):
-                    size = os.path.getsize(pdf_file)
-                    print(f"✓ Partitura básica criada com sucesso: {pdf_file} ({size} bytes)")
-                else:
-                    print("✗ Falha na criação da partitura básica")
-                    
-            except Exception as e:
-                print(f"✗ Erro na geração básica de partitura: {e}")
-            
-            # Teste 3: Geração avançada de partitura
-            print("\n3. Testando geração avançada de partitura...")
-            try:
-                sheet_creator = SheetMusicCreator(cache_folder=cache_dir)
-                
-                # Validar dados
-                if sheet_creator.validate_sheet_data(midi_segments, media_info):
-                    print("✓ Validação de dados de partitura passou")
-                    
-                    # Analisar tonalidade
-                    key = sheet_creator.analyze_musical_key(midi_segments)
-                    print(f"✓ Tonalidade detectada: {key}")
-                    
-                    # Sugerir compasso
-                    time_sig = sheet_creator.suggest_time_signature(midi_segments, media_info.bpm)
-                    print(f"✓ Compasso sugerido: {time_sig}")
-                    
-                    # Criar partitura avançada
-                    options = {
-                        "enhanced_formatting": True,
-                        "add_expressions": True,
-                        "auto_key_detection": True
-                    }
-                    
-                    result = sheet_creator.create_enhanced_sheet(
-                        midi_segments=midi_segments,
-                        output_folder_path=temp_dir,
-                        cache_folder_path=cache_dir,
-                        musescore_path=None,
-                        filename="test_enhanced_sheet",
-                        media_info=media_info,
-                        options=options
-                    )
-                    
-                    if result:
-                        size = os.path.getsize(result)
-                        print(f"✓ Partitura avançada criada com sucesso: {result} ({size} bytes)")
-                    else:
-                        print("✗ Falha na criação da partitura avançada")
-                else:
-                    print("✗ Validação de dados de partitura falhou:")
-                    for error in sheet_creator.get_validation_errors():
-                        print(f"  - {error}")
-                        
-            except Exception as e:
-                print(f"✗ Erro na geração avançada de partitura: {e}")
-                
-        else:
-            print("⚠ MuseScore não encontrado - pulando testes de partitura")
-            print("  Para testar partituras, instale o MuseScore em C:\\Program Files")
+    # Estimar propriedades
+    properties = midi_creator.estimate_midi_size(midi_segments)
+    print(f"✓ Propriedades estimadas: {properties}")
+    
+    # Criar MIDI avançado
+    metadata = {
+        "instrument_program": 0,
+        "created_by": "UltraSinger Test",
+        "version": "1.0"
+    }
+    
+    result = midi_creator.create_enhanced_midi_file(
+        real_bpm=media_info.bpm,
+        song_output=str(tmp_path),
+        midi_segments=midi_segments,
+        basename_without_ext="test_enhanced",
+        metadata=metadata
+    )
+    
+    assert result, "Falha na criação do MIDI avançado"
+    print(f"✓ MIDI avançado criado com sucesso: {result} ({os.path.getsize(result)} bytes)")
 
-def test_ultrastar_generation():
-    """Testar geração de arquivos UltraStar.txt"""
-    print("\n=== Testando Geração de UltraStar.txt ===")
+@pytest.fixture(scope='session')
+def musescore_version():
+    """Versão do MuseScore instalada; pula os testes de partitura quando ausente"""
+    from modules.sheet import find_musescore_version_in_path
     
-    midi_segments, media_info = create_test_data()
-    ultrastar_data = create_ultrastar_txt_data(midi_segments, media_info)
+    version = find_musescore_version_in_path('C:\\Program Files')
+    if version == -1:
+        pytest.skip("MuseScore não encontrado - instale o MuseScore em C:\\Program Files")
+    return version
+
+def test_sheet_basic(tmp_path, test_fixtures, musescore_version):
+    """Testar geração básica de partitura"""
+    midi_segments, media_info = test_fixtures
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
     
-    # Criar diretório temporário
-    with tempfile.TemporaryDirectory() as temp_dir:
-        print(f"Diretório temporário: {temp_dir}")
-        
-        # Teste 1: Geração básica de UltraStar.txt
-        print("\n1. Testando geração básica de UltraStar.txt...")
-        try:
-            from modules.Ultrastar.ultrastar_writer import create_ultrastar_txt
-            
-            # Adicionar arquivo MP3 obrigatório
-            ultrastar_data.mp3 = "test_song.mp3"
-            ultrastar_data.audio = "test_song.mp3"
-            
-            output_file = os.path.join(temp_dir, "test_basic.txt")
-            create_ultrastar_txt(midi_segments, output_file, ultrastar_data, media_info.bpm)
-            
-            if os.path.exists(output_file):
-                file_size = os.path.getsize(output_file)
-                print(f"✓ UltraStar.txt básico criado com sucesso: {output_file} ({file_size} bytes)")
-                
-                # Mostrar primeiras linhas
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()[:10]
-                    print("Primeiras linhas:")
-                    for line in lines:
-                        print(f"  {line.strip()}")
-            else:
-                print("✗ Falha na criação do UltraStar.txt básico")
-                
-        except Exception as e:
-            print(f"✗ Erro na geração básica de UltraStar.txt: {e}")
-        
-        # Teste 2: Geração avançada de UltraStar.txt
-        print("\n2. Testando geração avançada de UltraStar.txt...")
-        try:
-            writer = UltraStarWriter(cache_folder=temp_dir)
-            
-            # Validar dados (precisa dos midi_segments também)
-            if writer.validate_ultrastar_data(ultrastar_data, midi_segments):
-                print("✓ Validação de dados UltraStar passou")
-                
-                # Criar backup se necessário
-                output_file = os.path.join(temp_dir, "test_enhanced.txt")
-                backup = writer.create_backup(output_file)
-                
-                # Salvar metadados
-                writer.save_metadata(ultrastar_data, output_file)
-                
-                # Criar arquivo UltraStar.txt usando a função padrão
-                create_ultrastar_txt(midi_segments, output_file, ultrastar_data, media_info.bpm)
-                
-                if os.path.exists(output_file):
-                    file_size = os.path.getsize(output_file)
-                    print(f"✓ UltraStar.txt avançado criado com sucesso: {output_file} ({file_size} bytes)")
-                    
-                    # Mostrar primeiras linhas
-                    with open(output_file, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()[:10]
-                        print("Primeiras linhas:")
-                        for line in lines:
-                            print(f"  {line.strip()}")
-                else:
-                    print("✗ Falha na criação do UltraStar.txt avançado")
-            else:
-                print("✗ Validação de dados UltraStar falhou:")
-                for error in writer.get_validation_errors():
-                    print(f"  - {error}")
-                    
-        except Exception as e:
-            print(f"✗ Erro na geração avançada de UltraStar.txt: {e}")
+    create_sheet(
+        midi_segments=midi_segments,
+        output_folder_path=str(tmp_path),
+        cache_folder_path=str(cache_dir),
+        musescore_path=None,  # Auto-detectar
+        filename="test_basic_sheet",
+        media_info=media_info
+    )
+    
+    pdf_file = os.path.join(tmp_path, "test_basic_sheet.pdf")
+    size = file_size_or_none(pdf_file)
+    assert size, "Falha na criação da partitura básica"
+    print(f"✓ Partitura básica criada com sucesso: {pdf_file} ({size} bytes)")
 
-def main():
-    """Função principal de teste"""
-    print("🎵 TESTE COMPLETO DE GERAÇÃO DE ARQUIVOS ULTRASINGER 🎵")
-    print("=" * 60)
+def test_sheet_enhanced(tmp_path, test_fixtures):
+    """Testar geração avançada de partitura (só MusicXML, sem renderizar no MuseScore)"""
+    midi_segments, media_info = test_fixtures
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    sheet_creator = SheetMusicCreator(cache_folder=str(cache_dir))
     
-    try:
-        # Testar geração de MIDI
-        test_midi_generation()
-        
-        # Testar geração de partituras
-        test_sheet_generation()
+    # Validar dados
+    assert sheet_creator.validate_sheet_data(midi_segments, media_info), sheet_creator.get_validation_errors()
+    
+    # Analisar tonalidade
+    key = sheet_creator.analyze_musical_key(midi_segments)
+    print(f"✓ Tonalidade detectada: {key}")
+    
+    # Sugerir compasso
+    time_sig = sheet_creator.suggest_time_signature(midi_segments, media_info.bpm)
+    print(f"✓ Compasso sugerido: {time_sig}")
+    
+    # Criar partitura avançada
+    options = {
+        "enhanced_formatting": True,
+        "add_expressions": True,
+        "auto_key_detection": True,
+        "render": False
+    }
+    
+    result = sheet_creator.create_enhanced_sheet(
+        midi_segments=midi_segments,
+        output_folder_path=str(tmp_path),
+        cache_folder_path=str(cache_dir),
+        musescore_path=None,
+        filename="test_enhanced_sheet",
+        media_info=media_info,
+        options=options
+    )
+    
+    assert result, "Falha na criação da partitura avançada"
+    print(f"✓ Partitura avançada criada com sucesso: {result} ({os.path.getsize(result)} bytes)")
+
+@pytest.mark.parametrize("enhanced", [False, True], ids=["basic", "enhanced"])
+def test_ultrastar_generation(tmp_path, test_fixtures, enhanced):
+    """Testar geração de arquivos UltraStar.txt, com e sem o UltraStarWriter"""
+    from modules.Ultrastar.ultrastar_writer import create_ultrastar_txt
+    
+    midi_segments, media_info = test_fixtures
+    ultrastar_data = create_ultrastar_txt_data(midi_segments, media_info)
+    
+    # Adicionar arquivo MP3 obrigatório
+    ultrastar_data.mp3 = "test_song.mp3"
+    ultrastar_data.audio = "test_song.mp3"
+    
+    output_file = os.path.join(tmp_path, "test_enhanced.txt" if enhanced else "test_basic.txt")
+    
+    if enhanced:
+        writer = UltraStarWriter(cache_folder=str(tmp_path))
         
-        # Testar geração de UltraStar.txt
-        test_ultrastar_generation()
+        # Validar dados (precisa dos midi_segments também)
+        assert writer.validate_ultrastar_data(ultrastar_data, midi_segments), writer.get_validation_errors()
         
-        print("\n" + "=" * 60)
-        print("✓ TESTE COMPLETO FINALIZADO")
-        print("Todos os módulos de geração foram testados!")
+        # Criar backup se necessário
+        writer.create_backup(output_file)
         
-    except Exception as e:
-        print(f"\n✗ ERRO GERAL NO TESTE: {e}")
-        import traceback
-        traceback.print_exc()
+        # Salvar metadados
+        writer.save_metadata(ultrastar_data, output_file)
+    
+    # Criar arquivo UltraStar.txt usando a função padrão
+    create_ultrastar_txt(midi_segments, output_file, ultrastar_data, media_info.bpm)
+    
+    file_size = file_size_or_none(output_file)
+    assert file_size, "Falha na criação do UltraStar.txt"
+    print(f"✓ UltraStar.txt criado com sucesso: {output_file} ({file_size} bytes)")
+    
+    lines = _print_first_lines(output_file)
+    assert any(line.startswith(f"#{UltrastarTxtTag.TITLE}:") for line in lines)
+
+def main():
+    """Executar os testes com pytest (em paralelo quando o pytest-xdist estiver instalado)"""
+    return run_pytest(__file__)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -11,8 +11,8 @@ def test_demucs():
     print("=== Teste de Funcionalidade Demucs ===\n")
     
     print("Modelos Demucs disponíveis:")
-    for model in DemucsModel:
-        info = DemucsModel.get_model_info(model)
+    info_map = {model: DemucsModel.get_model_info(model) for model in DemucsModel}
+    for model, info in info_map.items():
         print(f"  - {model.value}: {info}")
     
     print("\nCompatibilidade de dispositivo:")
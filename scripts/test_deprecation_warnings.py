@@ -5,10 +5,18 @@ Testa diferentes versões do pyannote.audio para ver se resolvem os avisos
 """
 
 import os
+import re
 import sys
+import functools
+import importlib
+import importlib.metadata
+import importlib.util
 import warnings
 import subprocess
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from packaging.utils import canonicalize_name
 
 # Adicionar o diretório src ao path para importar módulos
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -17,11 +25,7 @@ try:
     from modules.version_manager import VersionManager
     from modules.console_colors import (
         ULTRASINGER_HEAD,
-        blue_highlighted,
-        gold_highlighted,
-        red_highlighted,
-        green_highlighted,
-        cyan_highlighted,
+        Bcolors,
     )
 except ImportError as e:
     print(f"Erro ao importar módulos: {e}")
@@ -29,9 +33,40 @@ except ImportError as e:
     sys.exit(1)
 
 
-def print_and_log(message: str) -> None:
-    """Função simples para imprimir mensagens"""
-    print(message)
+# Prefixos coloridos pré-montados para as linhas de log mais frequentes
+_PFX = ULTRASINGER_HEAD + ' '
+_RED_PFX = _PFX + Bcolors.red
+_GREEN_PFX = _PFX + Bcolors.dark_green
+_BLUE_PFX = _PFX + Bcolors.blue
+_GOLD_PFX = _PFX + Bcolors.gold
+_CYAN_PFX = _PFX + Bcolors.cyan
+_RESET = Bcolors.endc
+
+
+# Palavras-chave de avisos do SpeechBrain, compiladas uma única vez
+_SPEECHBRAIN_MESSAGE = re.compile(r"speechbrain|pretrained", re.IGNORECASE)
+_SPEECHBRAIN_FILENAME = re.compile(r"speechbrain", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class WarnRec:
+    """Registro compacto de um aviso capturado"""
+    category: str
+    message: str
+    filename: str
+    lineno: int
+    module: str
+
+    @classmethod
+    def from_warning(cls, warning: warnings.WarningMessage) -> "WarnRec":
+        """Cria o registro a partir de um aviso gravado por catch_warnings"""
+        return cls(
+            category=warning.category.__name__,
+            message=str(warning.message),
+            filename=warning.filename,
+            lineno=warning.lineno,
+            module=getattr(warning, 'module', 'unknown'),
+        )
 
 
 class DeprecationTester:
@@ -39,86 +74,89 @@ class DeprecationTester:
     
     def __init__(self):
         self.vm = VersionManager()
-        self.warnings_captured = []
+        self._buf = []
+    
+    def print_and_log(self, message: str) -> None:
+        """Acumula a mensagem para ser escrita junto com o resto da seção"""
+        self._buf.append(message)
+    
+    def _flush(self) -> None:
+        """Escreve as mensagens acumuladas com uma única escrita no stdout"""
+        if self._buf:
+            sys.stdout.write('\n'.join(self._buf) + '\n')
+            self._buf.clear()
+        sys.stdout.flush()
+    
+    @functools.cached_property
+    def versions_snapshot(self) -> dict:
+        """Versões instaladas lidas uma única vez dos metadados dos pacotes (nomes normalizados pela PEP 503)"""
+        return {
+            canonicalize_name(dist.metadata['Name']): dist.version
+            for dist in importlib.metadata.distributions()
+            if dist.metadata['Name']
+        }
     
-    def capture_warnings(self, message, category, filename, lineno, file=None, line=None) -> None:
-        """Captura avisos de deprecação"""
-        self.warnings_captured.append({
-            'category': category.__name__,
-            'message': str(message),
-            'filename': filename,
-            'lineno': lineno,
-            'module': 'unknown'
-        })
+    def installed_version(self, package: str) -> Optional[str]:
+        """Versão instalada do pacote, aceitando qualquer grafia do nome (-, _, . ou maiúsculas)"""
+        return self.versions_snapshot.get(canonicalize_name(package))
     
-    def test_import_with_warnings(self, module_name: str) -> Tuple[bool, List[dict]]:
+    def _invalidate_versions_snapshot(self) -> None:
+        """Descarta o snapshot após instalar outra versão"""
+        self.__dict__.pop('versions_snapshot', None)
+    
+    def test_import_with_warnings(self, module_name: str) -> Tuple[bool, List[warnings.WarningMessage]]:
         """
         Testa importação de um módulo capturando avisos
         
         Returns:
-            Tuple[bool, List[dict]]: (sucesso, lista_de_avisos)
+            Tuple[bool, List[warnings.WarningMessage]]: (sucesso, lista_de_avisos)
         """
-        self.warnings_captured = []
-        
         # Configurar captura de avisos
         with warnings.catch_warnings(record=True) as w:
             warnings.simplefilter("always")
-            warnings.showwarning = self.capture_warnings
+            
+            # Pular módulos ausentes sem pagar a importação. find_spec importa os pacotes pai,
+            # por isso fica dentro da captura: avisos emitidos por eles também contam
+            try:
+                spec = importlib.util.find_spec(module_name)
+            except ModuleNotFoundError:
+                spec = None
+            if spec is None:
+                self.print_and_log(_RED_PFX + f'Módulo {module_name} não encontrado' + _RESET)
+                return False, w
             
             try:
                 # Tentar importar o módulo
-                if module_name == "pyannote.audio.pipelines":
-                    import pyannote.audio.pipelines
-                elif module_name == "speechbrain.inference":
-                    import speechbrain.inference
-                elif module_name == "speechbrain.pretrained":
-                    import speechbrain.pretrained
-                else:
-                    __import__(module_name)
-                
-                # Capturar avisos do warnings.catch_warnings
-                for warning in w:
-                    self.warnings_captured.append({
-                        'category': warning.category.__name__,
-                        'message': str(warning.message),
-                        'filename': warning.filename,
-                        'lineno': warning.lineno,
-                        'module': getattr(warning, 'module', 'unknown')
-                    })
-                
-                return True, self.warnings_captured
+                importlib.import_module(module_name)
+                return True, w
                 
             except Exception as e:
-                print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted(f'Erro ao importar {module_name}: {e}')}")
-                return False, self.warnings_captured
+                self.print_and_log(_RED_PFX + f'Erro ao importar {module_name}: {e}' + _RESET)
+                return False, w
     
-    def filter_speechbrain_warnings(self, warnings_list: List[dict]) -> List[dict]:
+    def filter_speechbrain_warnings(self, warnings_list: List[warnings.WarningMessage]) -> List[warnings.WarningMessage]:
         """Filtra apenas avisos relacionados ao SpeechBrain"""
         speechbrain_warnings = []
         
         for warning in warnings_list:
-            message = warning['message'].lower()
-            filename = warning['filename'].lower()
-            
             # Verificar se o aviso está relacionado ao SpeechBrain
-            if any(keyword in message for keyword in ['speechbrain', 'pretrained']):
-                speechbrain_warnings.append(warning)
-            elif any(keyword in filename for keyword in ['speechbrain']):
+            if _SPEECHBRAIN_MESSAGE.search(str(warning.message)) or _SPEECHBRAIN_FILENAME.search(warning.filename):
                 speechbrain_warnings.append(warning)
         
         return speechbrain_warnings
     
     def test_current_setup(self) -> None:
         """Testa a configuração atual"""
-        print_and_log(f"{ULTRASINGER_HEAD} {gold_highlighted('=== Testando Configuração Atual ===')}")
+        self.print_and_log(_GOLD_PFX + '=== Testando Configuração Atual ===' + _RESET)
         
         # Verificar versões instaladas
-        pyannote_version = self.vm.get_installed_version("pyannote.audio")
-        speechbrain_version = self.vm.get_installed_version("speechbrain")
+        pyannote_version = self.installed_version("pyannote.audio")
+        speechbrain_version = self.installed_version("speechbrain")
         
-        print_and_log(f"{ULTRASINGER_HEAD} pyannote.audio: {pyannote_version or 'Não instalado'}")
-        print_and_log(f"{ULTRASINGER_HEAD} speechbrain: {speechbrain_version or 'Não instalado'}")
-        print_and_log("")
+        self.print_and_log(f"{_PFX}pyannote.audio: {pyannote_version or 'Não instalado'}")
+        self.print_and_log(f"{_PFX}speechbrain: {speechbrain_version or 'Não instalado'}")
+        self.print_and_log("")
+        self._flush()
         
         # Testar importações
         modules_to_test = [
@@ -127,35 +165,36 @@ class DeprecationTester:
         ]
         
         for module in modules_to_test:
-            print_and_log(f"{ULTRASINGER_HEAD} {blue_highlighted(f'Testando importação: {module}')}")
+            self.print_and_log(_BLUE_PFX + f'Testando importação: {module}' + _RESET)
             success, warnings_list = self.test_import_with_warnings(module)
             
             if success:
-                print_and_log(f"{ULTRASINGER_HEAD} {green_highlighted('✓ Importação bem-sucedida')}")
+                self.print_and_log(_GREEN_PFX + '✓ Importação bem-sucedida' + _RESET)
                 
                 # Filtrar avisos do SpeechBrain
                 sb_warnings = self.filter_speechbrain_warnings(warnings_list)
                 
                 if sb_warnings:
-                    print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted(f'⚠ {len(sb_warnings)} avisos do SpeechBrain encontrados:')}")
+                    self.print_and_log(_RED_PFX + f'⚠ {len(sb_warnings)} avisos do SpeechBrain encontrados:' + _RESET)
                     for warning in sb_warnings:
-                        print_and_log(f"  - {warning['category']}: {warning['message']}")
-                        print_and_log(f"    Arquivo: {warning['filename']}:{warning['lineno']}")
+                        self.print_and_log(f"  - {warning.category.__name__}: {warning.message}")
+                        self.print_and_log(f"    Arquivo: {warning.filename}:{warning.lineno}")
                 else:
-                    print_and_log(f"{ULTRASINGER_HEAD} {green_highlighted('✓ Nenhum aviso do SpeechBrain encontrado')}")
+                    self.print_and_log(_GREEN_PFX + '✓ Nenhum aviso do SpeechBrain encontrado' + _RESET)
                 
                 # Mostrar outros avisos se houver
                 other_warnings = [w for w in warnings_list if w not in sb_warnings]
                 if other_warnings:
-                    print_and_log(f"{ULTRASINGER_HEAD} {cyan_highlighted(f'ℹ {len(other_warnings)} outros avisos encontrados:')}")
+                    self.print_and_log(_CYAN_PFX + f'ℹ {len(other_warnings)} outros avisos encontrados:' + _RESET)
                     for warning in other_warnings[:3]:  # Mostrar apenas os primeiros 3
-                        print_and_log(f"  - {warning['category']}: {warning['message'][:100]}...")
+                        self.print_and_log(f"  - {warning.category.__name__}: {str(warning.message)[:100]}...")
                     if len(other_warnings) > 3:
-                        print_and_log(f"  ... e mais {len(other_warnings) - 3} avisos")
+                        self.print_and_log(f"  ... e mais {len(other_warnings) - 3} avisos")
             else:
-                print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted('✗ Falha na importação')}")
+                self.print_and_log(_RED_PFX + '✗ Falha na importação' + _RESET)
             
-            print_and_log("")
+            self.print_and_log("")
+            self._flush()
     
     def test_with_version(self, package: str, version: str) -> dict:
         """
@@ -164,38 +203,42 @@ class DeprecationTester:
         Returns:
             dict: Resultados do teste
         """
-        print_and_log(f"{ULTRASINGER_HEAD} {gold_highlighted(f'=== Testando {package} {version} ===')}")
+        self.print_and_log(_GOLD_PFX + f'=== Testando {package} {version} ===' + _RESET)
+        self._flush()
         
         # Verificar se a versão está disponível
         available_versions = self.vm.list_available_versions(package)
         if version not in available_versions:
-            print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted(f'Versão {version} não disponível')}")
+            self.print_and_log(_RED_PFX + f'Versão {version} não disponível' + _RESET)
             return {"success": False, "reason": "version_not_available"}
         
         # Verificar compatibilidade
         compatible, problems = self.vm.check_compatibility(package, version)
         if not compatible:
-            print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted('Versão marcada como incompatível:')}")
+            self.print_and_log(_RED_PFX + 'Versão marcada como incompatível:' + _RESET)
             for problem in problems:
-                print_and_log(f"  - {problem}")
+                self.print_and_log(f"  - {problem}")
             
+            self._flush()
             choice = input("Deseja testar mesmo assim? (s/N): ").strip().lower()
             if choice not in ['s', 'sim', 'y', 'yes']:
                 return {"success": False, "reason": "user_cancelled"}
         
         # Salvar versão atual
-        current_version = self.vm.get_installed_version(package)
+        current_version = self.installed_version(package)
         
         try:
             # Instalar versão de teste
-            print_and_log(f"{ULTRASINGER_HEAD} {blue_highlighted(f'Instalando {package} {version}...')}")
+            self.print_and_log(_BLUE_PFX + f'Instalando {package} {version}...' + _RESET)
+            self._flush()
             success = self.vm.install_version(package, version, force=True)
+            self._invalidate_versions_snapshot()
             
             if not success:
                 return {"success": False, "reason": "installation_failed"}
             
             # Testar importações
-            print_and_log(f"{ULTRASINGER_HEAD} {blue_highlighted('Testando importações...')}")
+            self.print_and_log(_BLUE_PFX + 'Testando importações...' + _RESET)
             
             results = {}
             modules_to_test = ["pyannote.audio.pipelines", "speechbrain.inference"]
@@ -208,7 +251,7 @@ class DeprecationTester:
                     "import_success": success,
                     "total_warnings": len(warnings_list),
                     "speechbrain_warnings": len(sb_warnings),
-                    "warnings_details": sb_warnings
+                    "warnings_details": [WarnRec.from_warning(warning) for warning in sb_warnings]
                 }
             
             return {
@@ -218,19 +261,23 @@ class DeprecationTester:
             }
             
         except Exception as e:
-            print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted(f'Erro durante o teste: {e}')}")
+            self.print_and_log(_RED_PFX + f'Erro durante o teste: {e}' + _RESET)
             return {"success": False, "reason": f"test_error: {e}"}
         
         finally:
+            self._flush()
             # Restaurar versão original se necessário
             if current_version and current_version != version:
-                print_and_log(f"{ULTRASINGER_HEAD} {cyan_highlighted(f'Restaurando versão original {current_version}...')}")
+                self.print_and_log(_CYAN_PFX + f'Restaurando versão original {current_version}...' + _RESET)
+                self._flush()
                 self.vm.install_version(package, current_version, force=True)
+                self._invalidate_versions_snapshot()
     
     def run_comprehensive_test(self) -> None:
         """Executa teste abrangente de todas as versões"""
-        print_and_log(f"{ULTRASINGER_HEAD} {gold_highlighted('=== Teste Abrangente de Versões ===')}")
-        print_and_log("")
+        self.print_and_log(_GOLD_PFX + '=== Teste Abrangente de Versões ===' + _RESET)
+        self.print_and_log("")
+        self._flush()
         
         # Testar configuração atual
         self.test_current_setup()
@@ -238,11 +285,12 @@ class DeprecationTester:
         # Testar pyannote.audio 4.0.0 se disponível
         available_versions = self.vm.list_available_versions("pyannote.audio")
         if "4.0.0" in available_versions:
-            print_and_log(f"{ULTRASINGER_HEAD} {blue_highlighted('Testando pyannote.audio 4.0.0...')}")
+            self.print_and_log(_BLUE_PFX + 'Testando pyannote.audio 4.0.0...' + _RESET)
+            self._flush()
             result = self.test_with_version("pyannote.audio", "4.0.0")
             
             if result["success"]:
-                print_and_log(f"{ULTRASINGER_HEAD} {green_highlighted('✓ Teste da versão 4.0.0 concluído')}")
+                self.print_and_log(_GREEN_PFX + '✓ Teste da versão 4.0.0 concluído' + _RESET)
                 
                 # Analisar resultados
                 total_sb_warnings = sum(
@@ -250,14 +298,15 @@ class DeprecationTester:
                 )
                 
                 if total_sb_warnings == 0:
-                    print_and_log(f"{ULTRASINGER_HEAD} {green_highlighted('🎉 pyannote.audio 4.0.0 resolve os avisos do SpeechBrain!')}")
+                    self.print_and_log(_GREEN_PFX + '🎉 pyannote.audio 4.0.0 resolve os avisos do SpeechBrain!' + _RESET)
                 else:
-                    print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted(f'pyannote.audio 4.0.0 ainda apresenta {total_sb_warnings} avisos do SpeechBrain')}")
+                    self.print_and_log(_RED_PFX + f'pyannote.audio 4.0.0 ainda apresenta {total_sb_warnings} avisos do SpeechBrain' + _RESET)
             else:
                 reason = result.get("reason", "unknown")
-                print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted(f'Teste da versão 4.0.0 falhou: {reason}')}")
+                self.print_and_log(_RED_PFX + f'Teste da versão 4.0.0 falhou: {reason}' + _RESET)
         
-        print_and_log(f"{ULTRASINGER_HEAD} {gold_highlighted('=== Teste Concluído ===')}")
+        self.print_and_log(_GOLD_PFX + '=== Teste Concluído ===' + _RESET)
+        self._flush()
 
 
 def main():
@@ -285,14 +334,15 @@ def main():
     elif args.package and args.version:
         result = tester.test_with_version(args.package, args.version)
         if result["success"]:
-            print_and_log(f"{ULTRASINGER_HEAD} {green_highlighted('Teste concluído com sucesso')}")
+            tester.print_and_log(_GREEN_PFX + 'Teste concluído com sucesso' + _RESET)
         else:
             reason = result.get("reason", "unknown")
-            print_and_log(f"{ULTRASINGER_HEAD} {red_highlighted(f'Teste falhou: {reason}')}")
+            tester.print_and_log(_RED_PFX + f'Teste falhou: {reason}' + _RESET)
+        tester._flush()
     else:
         # Teste padrão - configuração atual
         tester.test_current_setup()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
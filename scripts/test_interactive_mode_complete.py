@@ -3,21 +3,62 @@
 Teste completo do modo interativo do UltraSinger
 """
 
+import copy
 import os
 import sys
 import tempfile
 import json
-from unittest.mock import patch, MagicMock
+from contextlib import contextmanager
 from pathlib import Path
 
 # Adicionar o diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from rich.prompt import Prompt, Confirm
+
+import modules.init_interactive_mode as init_interactive_mode
 from modules.init_interactive_mode import InteractiveMode
 from modules.console_colors import ULTRASINGER_HEAD, green_highlighted, red_highlighted, blue_highlighted
 from Settings import Settings
 
 
+_MISSING = object()
+
+
+@contextmanager
+def swap(obj, attr, new):
+    """Trocar obj.attr por new durante o bloco, sem a maquinaria do mock.patch"""
+    # Olhar só o __dict__ do próprio objeto: atributos herdados são apagados na restauração em vez de copiados.
+    # Objetos com __slots__ (como InteractiveMode) não têm __dict__, então o valor atual é sempre o deles
+    old = vars(obj).get(attr, _MISSING) if hasattr(obj, '__dict__') else getattr(obj, attr)
+    setattr(obj, attr, new)
+    try:
+        yield new
+    finally:
+        if old is _MISSING:
+            delattr(obj, attr)
+        else:
+            setattr(obj, attr, old)
+
+
+def answer(*values):
+    """Substituto de Prompt.ask/Confirm.ask: uma resposta fixa, ou uma por chamada quando há várias"""
+    if len(values) == 1:
+        return lambda *args, **kwargs: values[0]
+    answers = iter(values)
+    return lambda *args, **kwargs: next(answers)
+
+
+class CallRecorder:
+    """Substituto de console.print que só registra as chamadas"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+
 def create_test_settings():
     """Criar configurações de teste"""
     settings = Settings()
@@ -28,406 +69,324 @@ def create_test_settings():
     return settings
 
 
+_BASE_SETTINGS = create_test_settings()
+_INTERACTIVE = None
+
+
+def get_interactive():
+    """Instância única de InteractiveMode, criada no primeiro uso e compartilhada pelos testes
+
+    Testes que alteram o estado da instância (como o arquivo de cache) devem restaurá-lo com swap().
+    """
+    global _INTERACTIVE
+    if _INTERACTIVE is None:
+        _INTERACTIVE = InteractiveMode()
+    return _INTERACTIVE
+
+
 def test_interactive_mode_initialization():
     """Testar inicialização do modo interativo"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Inicialização ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        
-        # Verificar atributos básicos
-        assert hasattr(interactive, 'console'), "Console não inicializado"
-        assert hasattr(interactive, 'header'), "Header não definido"
-        assert hasattr(interactive, 'settings_cache_file'), "Cache file não definido"
-        
-        print(f"✓ {green_highlighted('Modo interativo inicializado corretamente')}")
-        print(f"  - Console: {type(interactive.console).__name__}")
-        print(f"  - Header: {interactive.header}")
-        print(f"  - Cache file: {interactive.settings_cache_file}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro na inicialização: {e}')}")
-        return False
+    interactive = get_interactive()
+    
+    # Verificar atributos básicos
+    assert hasattr(interactive, 'console'), "Console não inicializado"
+    assert hasattr(interactive, 'header'), "Header não definido"
+    assert hasattr(interactive, 'settings_cache_file'), "Cache file não definido"
+    
+    print(f"✓ {green_highlighted('Modo interativo inicializado corretamente')}")
+    print(f"  - Console: {type(interactive.console).__name__}")
+    print(f"  - Header: {interactive.header}")
+    print(f"  - Cache file: {interactive.settings_cache_file}")
 
 
 def test_welcome_display():
     """Testar exibição da tela de boas-vindas"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Tela de Boas-vindas ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        
-        # Capturar saída do console
-        with patch.object(interactive.console, 'print') as mock_print:
-            interactive.display_welcome()
-            
-            # Verificar se houve chamadas para print
-            assert mock_print.called, "Display welcome não chamou console.print"
-            
-            # Verificar se contém elementos esperados
-            calls = [str(call) for call in mock_print.call_args_list]
-            welcome_content = ' '.join(calls)
-            
-            expected_elements = ['UltraSinger', 'bem-vindo', 'karaoke']
-            for element in expected_elements:
-                if element.lower() not in welcome_content.lower():
-                    print(f"⚠ {blue_highlighted(f'Elemento esperado não encontrado: {element}')}")
+    interactive = get_interactive()
+    
+    # Capturar saída do console
+    with swap(interactive.console, 'print', CallRecorder()) as console_print:
+        interactive.display_welcome()
         
-        print(f"✓ {green_highlighted('Tela de boas-vindas exibida corretamente')}")
-        print(f"  - Chamadas para console.print: {mock_print.call_count}")
+        # Verificar se houve chamadas para print
+        assert console_print.calls, "Display welcome não chamou console.print"
         
-        return True
+        # Verificar se contém elementos esperados
+        calls = [str(call) for call in console_print.calls]
+        welcome_content = ' '.join(calls)
         
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro na tela de boas-vindas: {e}')}")
-        return False
+        expected_elements = ['UltraSinger', 'bem-vindo', 'karaoke']
+        for element in expected_elements:
+            if element.lower() not in welcome_content.lower():
+                print(f"⚠ {blue_highlighted(f'Elemento esperado não encontrado: {element}')}")
+    
+    print(f"✓ {green_highlighted('Tela de boas-vindas exibida corretamente')}")
+    print(f"  - Chamadas para console.print: {len(console_print.calls)}")
 
 
 def test_audio_format_support():
     """Testar suporte a formatos de áudio"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Formatos de Áudio ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        
-        # Obter formatos suportados
-        supported_formats = interactive.get_supported_audio_formats()
-        
-        # Verificar se é uma lista
-        assert isinstance(supported_formats, list), "Formatos não retornados como lista"
-        assert len(supported_formats) > 0, "Nenhum formato suportado"
-        
-        # Verificar formatos esperados
-        expected_formats = ['.mp3', '.wav', '.flac']
-        for fmt in expected_formats:
-            assert fmt in supported_formats, f"Formato esperado não encontrado: {fmt}"
-        
-        print(f"✓ {green_highlighted('Formatos de áudio suportados:')}")
-        for fmt in supported_formats:
-            print(f"  - {fmt}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro nos formatos de áudio: {e}')}")
-        return False
+    interactive = get_interactive()
+    
+    # Obter formatos suportados
+    supported_formats = interactive.get_supported_audio_formats()
+    
+    # Verificar se é uma lista
+    assert isinstance(supported_formats, list), "Formatos não retornados como lista"
+    assert len(supported_formats) > 0, "Nenhum formato suportado"
+    
+    # Verificar formatos esperados
+    expected_formats = ['.mp3', '.wav', '.flac']
+    for fmt in expected_formats:
+        assert fmt in supported_formats, f"Formato esperado não encontrado: {fmt}"
+    
+    print(f"✓ {green_highlighted('Formatos de áudio suportados:')}")
+    for fmt in supported_formats:
+        print(f"  - {fmt}")
 
 
 def test_input_file_validation():
     """Testar validação de arquivo de entrada"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Validação de Entrada ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        settings = create_test_settings()
-        
-        # Criar arquivo de teste temporário
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-            temp_file.write(b'fake mp3 content')
-            temp_file_path = temp_file.name
-        
-        try:
-            # Simular entrada do usuário
-            with patch('rich.prompt.Prompt.ask') as mock_prompt:
-                mock_prompt.return_value = temp_file_path
-                
-                # Testar validação
-                result = interactive.validate_audio_file(temp_file_path)
-                
-                # Verificar resultado
-                assert isinstance(result, bool), "Resultado da validação deve ser boolean"
-                
-                print(f"✓ {green_highlighted('Validação de arquivo funcionando')}")
-                print(f"  - Arquivo: {temp_file_path}")
-                print(f"  - Válido: {result}")
-                
-        finally:
-            # Limpar arquivo temporário
-            os.unlink(temp_file_path)
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro na validação de entrada: {e}')}")
-        return False
+    interactive = get_interactive()
+    settings = copy.copy(_BASE_SETTINGS)
+    
+    # validate_audio_file só olha a extensão, então o arquivo não precisa existir
+    audio_path = os.path.join("fake", "path", "test.mp3")
+    
+    # Testar validação
+    result = interactive.validate_audio_file(audio_path)
+    
+    # Verificar resultado
+    assert isinstance(result, bool), "Resultado da validação deve ser boolean"
+    assert result, "Arquivo .mp3 deveria ser aceito"
+    
+    print(f"✓ {green_highlighted('Validação de arquivo funcionando')}")
+    print(f"  - Arquivo: {audio_path}")
+    print(f"  - Válido: {result}")
 
 
 def test_model_selection():
     """Testar seleção de modelos"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Seleção de Modelos ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        
-        # Importar enums de modelo
-        from modules.Speech_Recognition.Whisper import WhisperModel
-        from modules.Audio.separation import DemucsModel
+    interactive = get_interactive()
+    
+    # Importar enums de modelo
+    from modules.Speech_Recognition.Whisper import WhisperModel
+    from modules.Audio.separation import DemucsModel
+    
+    # Testar seleção de modelo Whisper
+    with swap(Prompt, 'ask', answer("1")):  # Selecionar primeiro modelo
+        selected_whisper = interactive.select_model_enhanced(
+            WhisperModel, "Whisper", WhisperModel.BASE, show_details=False
+        )
         
-        # Testar seleção de modelo Whisper
-        with patch('rich.prompt.Prompt.ask') as mock_prompt:
-            mock_prompt.return_value = "1"  # Selecionar primeiro modelo
-            
-            selected_whisper = interactive.select_model_enhanced(
-                WhisperModel, "Whisper", WhisperModel.BASE, show_details=False
-            )
-            
-            assert selected_whisper is not None, "Modelo Whisper não selecionado"
-            assert isinstance(selected_whisper, WhisperModel), "Tipo de modelo incorreto"
-            
-            print(f"✓ {green_highlighted('Seleção de modelo Whisper funcionando')}")
-            print(f"  - Modelo selecionado: {selected_whisper.value}")
+        assert selected_whisper is not None, "Modelo Whisper não selecionado"
+        assert isinstance(selected_whisper, WhisperModel), "Tipo de modelo incorreto"
         
-        # Testar seleção de modelo Demucs
-        with patch('rich.prompt.Prompt.ask') as mock_prompt:
-            mock_prompt.return_value = "1"  # Selecionar primeiro modelo
-            
-            selected_demucs = interactive.select_model_enhanced(
-                DemucsModel, "Demucs", DemucsModel.HTDEMUCS, show_details=False
-            )
-            
-            assert selected_demucs is not None, "Modelo Demucs não selecionado"
-            assert isinstance(selected_demucs, DemucsModel), "Tipo de modelo incorreto"
-            
-            print(f"✓ {green_highlighted('Seleção de modelo Demucs funcionando')}")
-            print(f"  - Modelo selecionado: {selected_demucs.value}")
+        print(f"✓ {green_highlighted('Seleção de modelo Whisper funcionando')}")
+        print(f"  - Modelo selecionado: {selected_whisper.value}")
+    
+    # Testar seleção de modelo Demucs
+    with swap(Prompt, 'ask', answer("1")):  # Selecionar primeiro modelo
+        selected_demucs = interactive.select_model_enhanced(
+            DemucsModel, "Demucs", DemucsModel.HTDEMUCS, show_details=False
+        )
         
-        return True
+        assert selected_demucs is not None, "Modelo Demucs não selecionado"
+        assert isinstance(selected_demucs, DemucsModel), "Tipo de modelo incorreto"
         
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro na seleção de modelos: {e}')}")
-        return False
+        print(f"✓ {green_highlighted('Seleção de modelo Demucs funcionando')}")
+        print(f"  - Modelo selecionado: {selected_demucs.value}")
 
 
 def test_advanced_configuration():
     """Testar configurações avançadas"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Configurações Avançadas ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        settings = create_test_settings()
+    interactive = get_interactive()
+    settings = copy.copy(_BASE_SETTINGS)
+    
+    # Testar configuração de processamento
+    # Textos: batch size, tipo de computação, step size e modelo do Crepe
+    # Sim/não: separação vocal, Whisper, Crepe, manter cache
+    with swap(Prompt, 'ask', answer("16", "float16", "10", "full")), \
+         swap(Confirm, 'ask', answer(True, True, True, False)):
+        interactive._configure_processing_options(settings)
         
-        # Testar configuração de processamento
-        with patch('rich.prompt.IntPrompt.ask') as mock_int_prompt, \
-             patch('rich.prompt.Confirm.ask') as mock_confirm:
-            
-            mock_int_prompt.return_value = 16  # batch_size
-            mock_confirm.return_value = False  # create_audio_stems
-            
-            interactive._configure_processing_options(settings)
-            
-            # Verificar se configurações foram aplicadas
-            assert hasattr(settings, 'whisper_batch_size'), "Batch size não configurado"
-            
-            print(f"✓ {green_highlighted('Configuração de processamento funcionando')}")
+        # Verificar se configurações foram aplicadas
+        assert settings.whisper_batch_size == 16, "Batch size não configurado"
         
-        # Testar configuração de saída
-        with patch('rich.prompt.Confirm.ask') as mock_confirm:
-            mock_confirm.return_value = True  # create_karaoke
-            
-            interactive._configure_output_options(settings)
-            
-            print(f"✓ {green_highlighted('Configuração de saída funcionando')}")
+        print(f"✓ {green_highlighted('Configuração de processamento funcionando')}")
+    
+    # Testar configuração de saída
+    with swap(Prompt, 'ask', answer("1.2.0")):  # Versão do formato UltraStar.txt
+        interactive._configure_output_options(settings)
         
-        # Testar configuração de dispositivo
-        with patch('rich.prompt.Confirm.ask') as mock_confirm, \
-             patch('modules.DeviceDetection.device_detection.check_gpu_support') as mock_gpu:
-            
-            mock_gpu.return_value = ("cuda", True)  # GPU disponível
-            mock_confirm.return_value = False  # force_cpu
-            
-            interactive._configure_device_options(settings)
-            
-            assert hasattr(settings, 'force_cpu'), "Force CPU não configurado"
-            
-            print(f"✓ {green_highlighted('Configuração de dispositivo funcionando')}")
+        print(f"✓ {green_highlighted('Configuração de saída funcionando')}")
+    
+    # Testar configuração de dispositivo
+    # check_gpu_support é trocado no módulo que o importou, onde ele é de fato chamado
+    # Sim/não: forçar CPU e, com GPU, Whisper e Crepe na CPU
+    with swap(Confirm, 'ask', answer(False, False, False)), \
+         swap(init_interactive_mode, 'check_gpu_support', answer(("cuda", True))):  # GPU disponível
+        interactive._configure_device_options(settings)
         
-        return True
+        assert settings.force_cpu is False, "Force CPU não configurado"
         
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro nas configurações avançadas: {e}')}")
-        return False
+        print(f"✓ {green_highlighted('Configuração de dispositivo funcionando')}")
 
 
 def test_settings_cache():
     """Testar sistema de cache de configurações"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Cache de Configurações ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        settings = create_test_settings()
-        
-        # Criar cache temporário
-        cache_data = {
-            'input_file_path': 'cached_input.mp3',
-            'output_file_path': 'cached_output',
-            'whisper_model': 'large',
-            'demucs_model': 'htdemucs_ft'
-        }
-        
+    interactive = get_interactive()
+    settings = copy.copy(_BASE_SETTINGS)
+    
+    # Importar enums de modelo
+    from modules.Speech_Recognition.Whisper import WhisperModel
+    from modules.Audio.separation import DemucsModel
+    
+    settings.whisper_model = WhisperModel.LARGE_V3
+    settings.demucs_model = DemucsModel.HTDEMUCS_FT
+    
+    with tempfile.TemporaryDirectory() as temp_dir, \
+         swap(interactive, 'settings_cache_file', os.path.join(temp_dir, "settings_cache.json")):
         # Salvar cache
-        interactive.save_settings_cache(cache_data)
+        interactive.save_settings_cache(settings)
         
         # Verificar se arquivo de cache foi criado
         assert os.path.exists(interactive.settings_cache_file), "Arquivo de cache não criado"
         
-        # Carregar cache
+        # Carregar cache: o dicionário salvo é reaproveitado da memória, sem reler o arquivo
         loaded_cache = interactive.load_settings_cache()
         
         assert loaded_cache is not None, "Cache não carregado"
-        assert loaded_cache['input_file_path'] == cache_data['input_file_path'], "Dados do cache incorretos"
+        assert loaded_cache['whisper_model'] == WhisperModel.LARGE_V3.value, "Dados do cache incorretos"
+        assert loaded_cache['demucs_model'] == DemucsModel.HTDEMUCS_FT.value, "Dados do cache incorretos"
+        assert interactive.load_settings_cache() is loaded_cache, "Cache deveria vir da memória"
         
         print(f"✓ {green_highlighted('Sistema de cache funcionando')}")
         print(f"  - Arquivo de cache: {interactive.settings_cache_file}")
-        print(f"  - Dados salvos: {len(cache_data)} itens")
-        
-        # Limpar cache de teste
-        if os.path.exists(interactive.settings_cache_file):
-            os.unlink(interactive.settings_cache_file)
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro no sistema de cache: {e}')}")
-        return False
+        print(f"  - Dados salvos: {len(loaded_cache)} itens")
 
 
 def test_summary_display():
     """Testar exibição do resumo"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Exibição de Resumo ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        settings = create_test_settings()
-        
-        # Configurar algumas opções
-        settings.create_karaoke = True
-        settings.create_audio_stems = False
-        settings.force_cpu = False
-        
-        # Capturar saída do console
-        with patch.object(interactive.console, 'print') as mock_print:
-            interactive.display_summary(settings)
-            
-            # Verificar se houve chamadas para print
-            assert mock_print.called, "Display summary não chamou console.print"
-            
-            print(f"✓ {green_highlighted('Exibição de resumo funcionando')}")
-            print(f"  - Chamadas para console.print: {mock_print.call_count}")
+    interactive = get_interactive()
+    settings = copy.copy(_BASE_SETTINGS)
+    
+    # Configurar algumas opções
+    settings.create_karaoke = True
+    settings.create_audio_stems = False
+    settings.force_cpu = False
+    
+    # Capturar saída do console; o resumo termina pedindo confirmação para continuar
+    with swap(interactive.console, 'print', CallRecorder()) as console_print, \
+         swap(Confirm, 'ask', answer(True)):
+        interactive.display_summary(settings)
         
-        return True
+        # Verificar se houve chamadas para print
+        assert console_print.calls, "Display summary não chamou console.print"
         
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro na exibição de resumo: {e}')}")
-        return False
+        print(f"✓ {green_highlighted('Exibição de resumo funcionando')}")
+        print(f"  - Chamadas para console.print: {len(console_print.calls)}")
 
 
 def test_full_interactive_flow():
     """Testar fluxo completo do modo interativo"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Fluxo Completo ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        settings = create_test_settings()
-        
-        # Simular entrada do usuário para fluxo completo
-        with patch('rich.prompt.Prompt.ask') as mock_prompt, \
-             patch('rich.prompt.Confirm.ask') as mock_confirm, \
-             patch('rich.prompt.IntPrompt.ask') as mock_int_prompt, \
-             patch.object(interactive, 'get_input_file_enhanced') as mock_input, \
-             patch.object(interactive, 'select_model_enhanced') as mock_model:
-            
-            # Configurar mocks
-            mock_confirm.side_effect = [
-                False,  # Não usar cache
-                False,  # Não configurar opções avançadas
-                True    # Confirmar configurações
-            ]
-            mock_input.return_value = None  # Simular entrada de arquivo
-            mock_model.return_value = MagicMock()  # Simular seleção de modelo
-            
-            # Executar fluxo (com timeout para evitar travamento)
-            try:
-                result_settings = interactive.run_interactive_mode(settings)
-                
-                assert result_settings is not None, "Configurações não retornadas"
-                assert isinstance(result_settings, Settings), "Tipo de retorno incorreto"
-                
-                print(f"✓ {green_highlighted('Fluxo completo executado com sucesso')}")
-                
-            except KeyboardInterrupt:
-                print(f"⚠ {blue_highlighted('Fluxo interrompido (esperado em teste)')}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro no fluxo completo: {e}')}")
-        return False
+    interactive = get_interactive()
+    settings = copy.copy(_BASE_SETTINGS)
+    
+    # Simular entrada do usuário para fluxo completo. O cache fica em uma pasta temporária:
+    # sem cache salvo não há pergunta sobre ele, e o fluxo não sobrescreve o do repositório
+    with tempfile.TemporaryDirectory() as temp_output, \
+         swap(interactive, 'settings_cache_file', os.path.join(temp_output, "settings_cache.json")), \
+         swap(Prompt, 'ask', answer(temp_output)), \
+         swap(Confirm, 'ask', answer(
+             False,  # Não personalizar os jobs (usa os padrões)
+             False,  # Não configurar opções avançadas
+             True    # Confirmar configurações
+         )), \
+         swap(InteractiveMode, 'get_input_file_enhanced', lambda self, settings: None), \
+         swap(InteractiveMode, 'select_model_enhanced', lambda self, model_enum, *args, **kwargs: next(iter(model_enum))):
+        
+        result_settings = interactive.run_interactive_mode(settings)
+        
+        assert result_settings is not None, "Configurações não retornadas"
+        assert isinstance(result_settings, Settings), "Tipo de retorno incorreto"
+        assert result_settings.output_folder_path == temp_output, "Pasta de saída não configurada"
+        
+        print(f"✓ {green_highlighted('Fluxo completo executado com sucesso')}")
 
 
 def test_error_handling():
     """Testar tratamento de erros"""
     print(f"\n{ULTRASINGER_HEAD} {blue_highlighted('=== Teste de Tratamento de Erros ===')}")
     
-    try:
-        interactive = InteractiveMode()
-        
-        # Testar arquivo inexistente
-        result = interactive.validate_audio_file("arquivo_inexistente.mp3")
-        assert result == False, "Validação deveria falhar para arquivo inexistente"
-        
-        print(f"✓ {green_highlighted('Tratamento de arquivo inexistente funcionando')}")
-        
-        # Testar cache corrompido
+    interactive = get_interactive()
+    
+    # Testar arquivo inexistente (validate_audio_file só olha a extensão; a existência é com validate_file_path)
+    result = interactive.validate_file_path("arquivo_inexistente.mp3")
+    assert result == False, "Validação deveria falhar para arquivo inexistente"
+    
+    print(f"✓ {green_highlighted('Tratamento de arquivo inexistente funcionando')}")
+    
+    # Testar cache corrompido, em um arquivo próprio: a instância compartilhada
+    # guarda em memória o último cache salvo no caminho padrão
+    with tempfile.TemporaryDirectory() as temp_dir, \
+         swap(interactive, 'settings_cache_file', os.path.join(temp_dir, "corrupted_cache.json")):
         with open(interactive.settings_cache_file, 'w') as f:
             f.write("cache corrompido")
         
         cache = interactive.load_settings_cache()
         assert cache is None, "Cache corrompido deveria retornar None"
-        
-        print(f"✓ {green_highlighted('Tratamento de cache corrompido funcionando')}")
-        
-        # Limpar cache de teste
-        if os.path.exists(interactive.settings_cache_file):
-            os.unlink(interactive.settings_cache_file)
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ {red_highlighted(f'Erro no tratamento de erros: {e}')}")
-        return False
+    
+    print(f"✓ {green_highlighted('Tratamento de cache corrompido funcionando')}")
+
 
+# Nome exibido -> função de teste, na ordem de execução
+_TESTS = (
+    ("Inicialização", test_interactive_mode_initialization),
+    ("Tela de Boas-vindas", test_welcome_display),
+    ("Formatos de Áudio", test_audio_format_support),
+    ("Validação de Entrada", test_input_file_validation),
+    ("Seleção de Modelos", test_model_selection),
+    ("Configurações Avançadas", test_advanced_configuration),
+    ("Cache de Configurações", test_settings_cache),
+    ("Exibição de Resumo", test_summary_display),
+    ("Fluxo Completo", test_full_interactive_flow),
+    ("Tratamento de Erros", test_error_handling),
+)
 
 def main():
     """Executar todos os testes do modo interativo"""
     print(f"{ULTRASINGER_HEAD} {blue_highlighted('🎵 INICIANDO TESTES DO MODO INTERATIVO 🎵')}")
     print("=" * 70)
     
-    tests = [
-        ("Inicialização", test_interactive_mode_initialization),
-        ("Tela de Boas-vindas", test_welcome_display),
-        ("Formatos de Áudio", test_audio_format_support),
-        ("Validação de Entrada", test_input_file_validation),
-        ("Seleção de Modelos", test_model_selection),
-        ("Configurações Avançadas", test_advanced_configuration),
-        ("Cache de Configurações", test_settings_cache),
-        ("Exibição de Resumo", test_summary_display),
-        ("Fluxo Completo", test_full_interactive_flow),
-        ("Tratamento de Erros", test_error_handling)
-    ]
-    
     passed = 0
-    total = len(tests)
+    total = len(_TESTS)
     
-    for test_name, test_func in tests:
+    for test_name, test_func in _TESTS:
         print(f"\n{'='*20} {test_name} {'='*20}")
         try:
-            if test_func():
-                passed += 1
-                print(f"\n✅ {green_highlighted(f'{test_name} - PASSOU')}")
-            else:
-                print(f"\n❌ {red_highlighted(f'{test_name} - FALHOU')}")
+            test_func()
+            passed += 1
+            print(f"\n✅ {green_highlighted(f'{test_name} - PASSOU')}")
+        except AssertionError as e:
+            print(f"\n❌ {red_highlighted(f'{test_name} - FALHOU: {e}')}")
         except Exception as e:
             print(f"\n💥 {red_highlighted(f'{test_name} - ERRO: {e}')}")
     
@@ -30,72 +30,76 @@ class DemucsModel(Enum):
     @classmethod
     def get_model_info(cls, model: 'DemucsModel') -> dict:
         """Get detailed information about a specific model"""
-        model_info = {
-            cls.HTDEMUCS: {
-                "description": "Hybrid Transformer Demucs - Default model, good balance of quality and speed",
-                "quality": "High",
-                "speed": "Fast",
-                "sources": 4,
-                "recommended_for": "General use"
-            },
-            cls.HTDEMUCS_FT: {
-                "description": "Fine-tuned HTDEMUCS - Better quality but 4x slower",
-                "quality": "Very High",
-                "speed": "Slow",
-                "sources": 4,
-                "recommended_for": "High quality separation"
-            },
-            cls.HTDEMUCS_6S: {
-                "description": "6-source HTDEMUCS - Includes piano and guitar separation",
-                "quality": "High",
-                "speed": "Medium",
-                "sources": 6,
-                "recommended_for": "Complex music with multiple instruments"
-            },
-            cls.HDEMUCS_MMI: {
-                "description": "Hybrid Demucs v3 - Retrained version",
-                "quality": "High",
-                "speed": "Fast",
-                "sources": 4,
-                "recommended_for": "Alternative to HTDEMUCS"
-            },
-            cls.MDX: {
-                "description": "MDX Challenge winner - Excellent for vocals",
-                "quality": "Very High",
-                "speed": "Medium",
-                "sources": 4,
-                "recommended_for": "Vocal-focused separation"
-            },
-            cls.MDX_EXTRA: {
-                "description": "MDX with extra training data - Top quality",
-                "quality": "Excellent",
-                "speed": "Medium",
-                "sources": 4,
-                "recommended_for": "Professional vocal separation"
-            },
-            cls.MDX_Q: {
-                "description": "Quantized MDX - Smaller size, slightly lower quality",
-                "quality": "High",
-                "speed": "Fast",
-                "sources": 4,
-                "recommended_for": "Limited storage/memory"
-            },
-            cls.MDX_EXTRA_Q: {
-                "description": "Quantized MDX Extra - Best balance of size and quality",
-                "quality": "Very High",
-                "speed": "Fast",
-                "sources": 4,
-                "recommended_for": "Optimal balance"
-            },
-            cls.SIG: {
-                "description": "Single model from model zoo",
-                "quality": "Variable",
-                "speed": "Variable",
-                "sources": 4,
-                "recommended_for": "Experimental use"
-            }
-        }
-        return model_info.get(model, {})
+        return _DEMUCS_MODEL_INFO.get(model, {})
+
+
+# Built once at import time instead of on every get_model_info call
+_DEMUCS_MODEL_INFO = {
+    DemucsModel.HTDEMUCS: {
+        "description": "Hybrid Transformer Demucs - Default model, good balance of quality and speed",
+        "quality": "High",
+        "speed": "Fast",
+        "sources": 4,
+        "recommended_for": "General use"
+    },
+    DemucsModel.HTDEMUCS_FT: {
+        "description": "Fine-tuned HTDEMUCS - Better quality but 4x slower",
+        "quality": "Very High",
+        "speed": "Slow",
+        "sources": 4,
+        "recommended_for": "High quality separation"
+    },
+    DemucsModel.HTDEMUCS_6S: {
+        "description": "6-source HTDEMUCS - Includes piano and guitar separation",
+        "quality": "High",
+        "speed": "Medium",
+        "sources": 6,
+        "recommended_for": "Complex music with multiple instruments"
+    },
+    DemucsModel.HDEMUCS_MMI: {
+        "description": "Hybrid Demucs v3 - Retrained version",
+        "quality": "High",
+        "speed": "Fast",
+        "sources": 4,
+        "recommended_for": "Alternative to HTDEMUCS"
+    },
+    DemucsModel.MDX: {
+        "description": "MDX Challenge winner - Excellent for vocals",
+        "quality": "Very High",
+        "speed": "Medium",
+        "sources": 4,
+        "recommended_for": "Vocal-focused separation"
+    },
+    DemucsModel.MDX_EXTRA: {
+        "description": "MDX with extra training data - Top quality",
+        "quality": "Excellent",
+        "speed": "Medium",
+        "sources": 4,
+        "recommended_for": "Professional vocal separation"
+    },
+    DemucsModel.MDX_Q: {
+        "description": "Quantized MDX - Smaller size, slightly lower quality",
+        "quality": "High",
+        "speed": "Fast",
+        "sources": 4,
+        "recommended_for": "Limited storage/memory"
+    },
+    DemucsModel.MDX_EXTRA_Q: {
+        "description": "Quantized MDX Extra - Best balance of size and quality",
+        "quality": "Very High",
+        "speed": "Fast",
+        "sources": 4,
+        "recommended_for": "Optimal balance"
+    },
+    DemucsModel.SIG: {
+        "description": "Single model from model zoo",
+        "quality": "Variable",
+        "speed": "Variable",
+        "sources": 4,
+        "recommended_for": "Experimental use"
+    }
+}
+
 
 def check_device_compatibility(device: str) -> str:
     """Check and validate device compatibility"""
@@ -1,9 +1,47 @@
 from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class MidiSegment:
   note: str
   start: float
   end: float
   word: str
+
+  @classmethod
+  def from_arrays(cls, notes, starts, ends, words) -> "MidiSegmentArray":
+    """Create a column oriented array of segments without building a MidiSegment per entry"""
+    return MidiSegmentArray(notes, starts, ends, words)
+
+
+class MidiSegmentArray:
+  """Midi segments stored as four aligned numpy arrays (structure of arrays)"""
+
+  __slots__ = ("notes", "starts", "ends", "words")
+
+  def __init__(self, notes, starts, ends, words):
+    self.notes = np.asarray(notes)
+    self.starts = np.asarray(starts, dtype=np.float64)
+    self.ends = np.asarray(ends, dtype=np.float64)
+    self.words = np.asarray(words)
+    if not len(self.notes) == len(self.starts) == len(self.ends) == len(self.words):
+      raise ValueError("notes, starts, ends and words must have the same length")
+
+  def __len__(self) -> int:
+    return len(self.starts)
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      # Slicing returns views on the same arrays
+      return MidiSegmentArray(self.notes[index], self.starts[index], self.ends[index], self.words[index])
+    return MidiSegment(str(self.notes[index]), float(self.starts[index]), float(self.ends[index]), str(self.words[index]))
+
+  def __iter__(self):
+    for note, start, end, word in zip(self.notes.tolist(), self.starts.tolist(), self.ends.tolist(), self.words.tolist()):
+      yield MidiSegment(note, start, end, word)
+
+  def to_list(self) -> list[MidiSegment]:
+    """Materialize the segments for code that expects a list of MidiSegment"""
+    return list(self)
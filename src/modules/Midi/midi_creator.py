@@ -3,6 +3,8 @@
 import math
 import os
 import json
+import shutil
+import hashlib
 from collections import Counter
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -171,6 +173,18 @@ class MidiCreator:
         except Exception as e:
             print(f"{ULTRASINGER_HEAD} {red_highlighted('Failed to save MIDI metadata:')} {e}")
     
+    @staticmethod
+    def get_midi_cache_key(midi_segments: List[MidiSegment], bpm: float,
+                           metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Content addressed cache key for the MIDI generated from these segments"""
+        content = {
+            "bpm": bpm,
+            "segments": [(s.note, s.start, s.end, s.word) for s in midi_segments],
+            "metadata": metadata or {},
+        }
+        serialized = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.blake2b(serialized.encode('utf-8'), digest_size=16).hexdigest()
+    
     def create_enhanced_midi_file(self, 
                                 real_bpm: float,
                                 song_output: str,
@@ -185,6 +199,18 @@ class MidiCreator:
                 print(f"  - {error}")
             return None
         
+        midi_output = os.path.join(song_output, f"{basename_without_ext}.mid")
+        cache_file = None
+        if self.cache_folder:
+            cache_key = self.get_midi_cache_key(midi_segments, real_bpm, metadata)
+            cache_file = os.path.join(self.cache_folder, f"{cache_key}.mid.cache")
+            if os.path.exists(cache_file):
+                shutil.copyfile(cache_file, midi_output)
+                # The metadata entry is per output path, so a new song folder still needs its own
+                self.save_midi_metadata(midi_segments, midi_output, real_bpm)
+                print(f"{ULTRASINGER_HEAD} {green_highlighted('cache')} reusing cached MIDI file -> {midi_output}")
+                return midi_output
+        
         print(f"{ULTRASINGER_HEAD} Creating enhanced MIDI with {blue_highlighted('pretty_midi')}")
         
         try:
@@ -192,12 +218,15 @@ class MidiCreator:
             instrument = self._create_enhanced_instrument(midi_segments, metadata)
             
             # Create MIDI file
-            midi_output = os.path.join(song_output, f"{basename_without_ext}.mid")
             self._create_enhanced_midi(instrument, real_bpm, midi_output, midi_segments, metadata)
             
             # Save metadata
             self.save_midi_metadata(midi_segments, midi_output, real_bpm)
             
+            if cache_file:
+                os.makedirs(self.cache_folder, exist_ok=True)
+                shutil.copyfile(midi_output, cache_file)
+            
             print(f"{ULTRASINGER_HEAD} {green_highlighted('MIDI file created successfully:')} {midi_output}")
             return midi_output
             
@@ -1,6 +1,7 @@
 """Pitched data"""
 from dataclasses import dataclass
 
+import numpy as np
 from dataclasses_json import dataclass_json
 
 
@@ -12,3 +13,33 @@ class PitchedData:
     times: list[float]
     frequencies: list[float]
     confidence: list[float]
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "PitchedData":
+        """Create pitched data whose fields are column views of one (N, 3) float64 matrix"""
+        matrix = np.ascontiguousarray(matrix, dtype=np.float64).reshape(-1, 3)
+        return cls(matrix[:, 0], matrix[:, 1], matrix[:, 2])
+
+    def to_matrix(self) -> np.ndarray:
+        """Return times, frequencies and confidence as one contiguous (N, 3) float64 matrix"""
+        columns = (self.times, self.frequencies, self.confidence)
+        if all(
+            isinstance(column, np.ndarray)
+            and column.dtype == np.float64
+            and column.ndim == 1
+            and len(column) == len(self.times)
+            and column.strides == (3 * column.itemsize,)
+            and column.ctypes.data == self.times.ctypes.data + offset * column.itemsize
+            for offset, column in enumerate(columns)
+        ):
+            # Fields are already interleaved columns of one matrix, view it without copying
+            return np.lib.stride_tricks.as_strided(
+                self.times, shape=(len(self.times), 3), strides=(3 * self.times.itemsize, self.times.itemsize)
+            )
+        return np.column_stack(
+            (
+                np.asarray(self.times, dtype=np.float64),
+                np.asarray(self.frequencies, dtype=np.float64),
+                np.asarray(self.confidence, dtype=np.float64),
+            )
+        )
@@ -1,6 +1,5 @@
 """Enhanced Pitcher module with Crepe pitch detection"""
 import os
-import json
 import numpy as np
 import torch
 from enum import Enum
@@ -138,38 +137,72 @@ def validate_step_size(step_size: int) -> int:
         return 100
     return step_size
 
-def save_pitch_cache(cache_path: str, pitched_data: PitchedData) -> None:
-    """Save pitch detection result to cache"""
+# Confidence in [0, 1] is stored on disk as uint8 steps of 1/255
+PITCH_CACHE_CONFIDENCE_SCALE = 255.0
+
+def get_source_signature(source_path: str) -> Tuple[int, int]:
+    """Get (mtime_ns, size) of the audio a cache entry was generated from"""
+    stat_result = os.stat(source_path)
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+def save_pitch_cache(cache_path: str, pitched_data: PitchedData, source: str = None) -> None:
+    """Save pitch detection result to cache with quantized columns
+
+    Times are stored as float32, frequencies as float16 and confidence as uint8.
+    When a source audio path is given its mtime and size are stored so the
+    entry is invalidated once the audio changes.
+    """
     try:
-        cache_data = {
-            "times": pitched_data.times.tolist() if hasattr(pitched_data.times, 'tolist') else list(pitched_data.times),
-            "frequencies": pitched_data.frequencies.tolist() if hasattr(pitched_data.frequencies, 'tolist') else list(pitched_data.frequencies),
-            "confidence": pitched_data.confidence if isinstance(pitched_data.confidence, list) else list(pitched_data.confidence)
-        }
-        
+        matrix = pitched_data.to_matrix()
+        confidence = np.clip(matrix[:, 2], 0.0, 1.0) * PITCH_CACHE_CONFIDENCE_SCALE
+
+        header = {"confidence_scale": np.float64(PITCH_CACHE_CONFIDENCE_SCALE)}
+        if source is not None:
+            source_mtime_ns, source_size = get_source_signature(source)
+            header["source_mtime_ns"] = np.int64(source_mtime_ns)
+            header["source_size"] = np.int64(source_size)
+
         os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        # Write through a file handle so np.savez does not append a .npz suffix
+        with open(cache_path, 'wb') as f:
+            np.savez(
+                f,
+                times=matrix[:, 0].astype(np.float32),
+                frequencies=matrix[:, 1].astype(np.float16),
+                confidence=confidence.round().astype(np.uint8),
+                **header,
+            )
             
         print(f"{ULTRASINGER_HEAD} {green_highlighted('cache')} Pitch data saved to cache")
         
     except Exception as e:
         print(f"{ULTRASINGER_HEAD} {yellow_highlighted('Warning:')} Failed to save pitch cache: {str(e)}")
 
-def load_pitch_cache(cache_path: str) -> Optional[PitchedData]:
-    """Load pitch detection result from cache"""
+def load_pitch_cache(cache_path: str, source: str = None) -> Optional[PitchedData]:
+    """Load pitch detection result from cache
+
+    Returns None when a source audio path is given and it no longer matches
+    the mtime and size recorded with the cache entry.
+    """
     try:
         if not os.path.exists(cache_path):
             return None
             
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
+        with open(cache_path, 'rb') as f, np.load(f, allow_pickle=False) as cache_data:
+            if source is not None:
+                if "source_mtime_ns" not in cache_data.files or "source_size" not in cache_data.files:
+                    return None
+                cached_signature = (int(cache_data["source_mtime_ns"]), int(cache_data["source_size"]))
+                if cached_signature != get_source_signature(source):
+                    print(f"{ULTRASINGER_HEAD} {yellow_highlighted('cache')} Source audio changed, pitch cache is stale")
+                    return None
+
+            matrix = np.empty((len(cache_data["times"]), 3), dtype=np.float64)
+            matrix[:, 0] = cache_data["times"]
+            matrix[:, 1] = cache_data["frequencies"]
+            matrix[:, 2] = cache_data["confidence"] / float(cache_data["confidence_scale"])
         
-        pitched_data = PitchedData(
-            times=np.array(cache_data["times"]),
-            frequencies=np.array(cache_data["frequencies"]),
-            confidence=cache_data["confidence"]
-        )
+        pitched_data = PitchedData.from_matrix(matrix)
         
         print(f"{ULTRASINGER_HEAD} {green_highlighted('cache')} Loaded pitch data from cache")
         return pitched_data
@@ -180,7 +213,7 @@ def load_pitch_cache(cache_path: str) -> Optional[PitchedData]:
 
 def validate_pitch_quality(pitched_data: PitchedData, confidence_threshold: float = 0.4) -> Dict:
     """Validate the quality of pitch detection results"""
-    if not pitched_data.confidence:
+    if len(pitched_data.confidence) == 0:
         return {
             "total_frames": 0,
             "high_confidence_frames": 0,
@@ -217,7 +250,7 @@ def get_pitch_with_crepe_file(
     
     # Check cache first
     if cache_path and not skip_cache:
-        cached_result = load_pitch_cache(cache_path)
+        cached_result = load_pitch_cache(cache_path, source=filename)
         if cached_result:
             return cached_result
     
@@ -271,7 +304,7 @@ def get_pitch_with_crepe_file(
         
         # Save to cache
         if cache_path:
-            save_pitch_cache(cache_path, pitched_data)
+            save_pitch_cache(cache_path, pitched_data, source=filename)
         
         print(f"{ULTRASINGER_HEAD} {green_highlighted('Success:')} Pitch detection completed successfully")
         
@@ -320,19 +353,15 @@ def get_pitched_data_with_high_confidence(
     pitched_data: PitchedData, threshold: float = 0.4
 ) -> PitchedData:
     """Get frequency with high confidence - enhanced version"""
-    if not pitched_data.confidence:
+    if len(pitched_data.confidence) == 0:
         print(f"{ULTRASINGER_HEAD} {yellow_highlighted('Warning:')} No confidence data available")
         return pitched_data
     
-    new_pitched_data = PitchedData([], [], [])
-    high_conf_count = 0
-    
-    for i, conf in enumerate(pitched_data.confidence):
-        if conf > threshold:
-            new_pitched_data.times.append(pitched_data.times[i])
-            new_pitched_data.frequencies.append(pitched_data.frequencies[i])
-            new_pitched_data.confidence.append(pitched_data.confidence[i])
-            high_conf_count += 1
+    # Filter whole rows of the (N, 3) matrix in one pass instead of three parallel lists
+    matrix = pitched_data.to_matrix()
+    high_confidence_rows = matrix[matrix[:, 2] > threshold]
+    new_pitched_data = PitchedData.from_matrix(high_confidence_rows)
+    high_conf_count = len(high_confidence_rows)
 
     total_frames = len(pitched_data.confidence)
     confidence_ratio = high_conf_count / total_frames if total_frames > 0 else 0.0
@@ -360,7 +389,7 @@ def get_optimal_step_size(audio_duration: float, target_frames: int = 1000) -> i
 
 def analyze_pitch_statistics(pitched_data: PitchedData) -> Dict:
     """Analyze pitch statistics for quality assessment"""
-    if not pitched_data.frequencies:
+    if len(pitched_data.frequencies) == 0:
         return {}
     
     frequencies = np.array(pitched_data.frequencies)
@@ -38,6 +38,31 @@ MAX_SONG_SCORE = 10000
 MAX_SONG_LINE_BONUS = 1000
 
 
+def _build_note_midi_lut() -> Dict[str, int]:
+    """Build a note name -> midi number table for every octave librosa can name"""
+    sharp_names = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+    flat_names = ("C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B")
+    lut = {}
+    for octave in range(-1, 10):
+        for index, (sharp, flat) in enumerate(zip(sharp_names, flat_names)):
+            midi = 12 * (octave + 1) + index
+            # librosa.midi_to_note produces unicode accidentals by default
+            for name in (sharp, sharp.replace("#", "♯"), flat, flat.replace("b", "♭")):
+                lut[f"{name}{octave}"] = midi
+    return lut
+
+
+_NOTE_MIDI = _build_note_midi_lut()
+
+
+def note_to_midi(note: str) -> float:
+    """Convert a note name to its midi number, parsing with librosa only for uncommon spellings"""
+    midi = _NOTE_MIDI.get(note)
+    if midi is None:
+        midi = librosa.note_to_midi(note)
+    return midi
+
+
 @dataclass_json
 @dataclass
 class Points:
@@ -107,8 +132,8 @@ class UltrastarScoreCalculator:
     def calculate_pitch_accuracy(self, target_note: str, sung_note: str, tolerance: float = 0.5) -> Tuple[bool, float]:
         """Calculate pitch accuracy with tolerance"""
         try:
-            target_midi = librosa.note_to_midi(target_note)
-            sung_midi = librosa.note_to_midi(sung_note)
+            target_midi = note_to_midi(target_note)
+            sung_midi = note_to_midi(sung_note)
             
             difference = abs(target_midi - sung_midi)
             accuracy = max(0, 1 - (difference / 12))  # 12 semitones = 1 octave
@@ -119,6 +144,30 @@ class UltrastarScoreCalculator:
         except Exception:
             return False, 0.0
     
+    def calculate_pitch_accuracy_batch(self, target_notes: List[str], sung_notes: List[str],
+                                       tolerance: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate pitch accuracy for aligned lists of notes in one vectorized pass"""
+        if len(target_notes) != len(sung_notes):
+            raise ValueError(
+                f"target_notes and sung_notes must have the same length "
+                f"({len(target_notes)} != {len(sung_notes)})"
+            )
+
+        def to_midi(note: str) -> float:
+            try:
+                return note_to_midi(note)
+            except Exception:
+                return np.nan
+
+        target_midi = np.fromiter((to_midi(note) for note in target_notes), dtype=np.float64, count=len(target_notes))
+        sung_midi = np.fromiter((to_midi(note) for note in sung_notes), dtype=np.float64, count=len(sung_notes))
+
+        difference = np.abs(target_midi - sung_midi)
+        valid = ~np.isnan(difference)
+        accuracy = np.where(valid, np.maximum(0.0, 1.0 - difference / 12), 0.0)  # 12 semitones = 1 octave
+        is_accurate = valid & (difference <= tolerance)
+        return is_accurate, accuracy
+
     def calculate_timing_accuracy(self, expected_start: float, expected_end: float, 
                                 actual_start: float, actual_end: float) -> float:
         """Calculate timing accuracy"""
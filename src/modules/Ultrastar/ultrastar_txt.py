@@ -5,6 +5,8 @@ from dataclasses import dataclass, field
 from typing import List
 
 FILE_ENCODING = "utf-8"
+# Write buffer for UltraStar files, large enough to hold a whole song in one syscall
+FILE_BUFFER_SIZE = 128 * 1024
 
 
 class UltrastarTxtTag(str, Enum):
@@ -6,15 +6,22 @@ import langcodes
 from packaging import version
 from typing import Optional, List, Dict, Any
 import json
+import hashlib
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from modules.console_colors import ULTRASINGER_HEAD, red_highlighted, green_highlighted, blue_highlighted
 from modules.Ultrastar.coverter.ultrastar_converter import (
     real_bpm_to_ultrastar_bpm,
     second_to_beat, )
 from modules.Ultrastar.coverter.ultrastar_midi_converter import convert_midi_note_to_ultrastar_note
 from modules.Ultrastar.ultrastar_txt import UltrastarTxtValue, UltrastarTxtTag, UltrastarTxtNoteTypeTag, \
-    FILE_ENCODING
+    FILE_ENCODING, FILE_BUFFER_SIZE
 from modules.Ultrastar.ultrastar_score_calculator import Score
 from modules.Midi.MidiSegment import MidiSegment
 
@@ -53,7 +60,7 @@ def create_ultrastar_txt(
     ultrastar_bpm = ultrastar_bpm * get_multiplier(ultrastar_bpm)
     silence_split_duration = calculate_silent_beat_length(midi_segments)
 
-    with open(ultrastar_file_output, "w", encoding=FILE_ENCODING) as file:
+    with open(ultrastar_file_output, "w", encoding=FILE_ENCODING, buffering=FILE_BUFFER_SIZE) as file:
         gap = midi_segments[0].start
 
         if version.parse(ultrastar_class.version) >= version.parse("1.0.0"):
@@ -193,7 +200,7 @@ def create_repitched_txt_from_ultrastar_data(
 
     i = 0
     # todo: just add '_repitched' to input_file
-    with open(output_repitched_ultrastar, "w", encoding=FILE_ENCODING) as file:
+    with open(output_repitched_ultrastar, "w", encoding=FILE_ENCODING, buffering=FILE_BUFFER_SIZE) as file:
         for line in txt:
             if line.startswith(f"{UltrastarTxtNoteTypeTag.NORMAL} "):
                 parts = re.findall(r"\S+|\s+", line)
@@ -238,7 +245,7 @@ def add_score_to_ultrastar_txt(ultrastar_file_output: str, score: Score) -> None
 
     text = "\n".join(text)
 
-    with open(ultrastar_file_output, "w", encoding=FILE_ENCODING) as file:
+    with open(ultrastar_file_output, "w", encoding=FILE_ENCODING, buffering=FILE_BUFFER_SIZE) as file:
         file.write(text)
 
 
@@ -290,10 +297,14 @@ class UltraStarWriter:
                 print(f"{ULTRASINGER_HEAD} {red_highlighted('Failed to create backup:')} {e}")
         return None
     
-    def save_metadata(self, ultrastar_class: UltrastarTxtValue, output_path: str):
-        """Save metadata to cache for future use"""
+    def save_metadata(self, ultrastar_class: UltrastarTxtValue, output_path: str) -> bool:
+        """Save metadata to cache for future use
+
+        Returns False without touching the cache when the metadata is identical
+        to the last saved entry.
+        """
         if not self.cache_folder:
-            return
+            return False
             
         metadata = {
             "artist": ultrastar_class.artist,
@@ -303,19 +314,35 @@ class UltraStarWriter:
             "genre": ultrastar_class.genre,
             "creator": ultrastar_class.creator,
             "version": ultrastar_class.version,
-            "created_at": datetime.now().isoformat(),
             "output_path": output_path
         }
+        if ORJSON_AVAILABLE:
+            serialized = orjson.dumps(metadata, option=orjson.OPT_SORT_KEYS)
+        else:
+            serialized = json.dumps(metadata, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        content_hash = hashlib.blake2b(serialized, digest_size=8).hexdigest()
+        metadata["created_at"] = datetime.now().isoformat()
         
         try:
             os.makedirs(self.cache_folder, exist_ok=True)
             metadata_file = os.path.join(self.cache_folder, "ultrastar_metadata.json")
+            hash_file = f"{metadata_file}.hash"
+            
+            # Skip the JSON round trip when the last saved entry has the same content
+            if os.path.exists(metadata_file) and os.path.exists(hash_file):
+                with open(hash_file, 'r', encoding='utf-8') as f:
+                    if f.read() == content_hash:
+                        return False
             
             # Load existing metadata
             existing_metadata = []
             if os.path.exists(metadata_file):
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    existing_metadata = json.load(f)
+                if ORJSON_AVAILABLE:
+                    with open(metadata_file, 'rb') as f:
+                        existing_metadata = orjson.loads(f.read())
+                else:
+                    with open(metadata_file, 'r', encoding='utf-8') as f:
+                        existing_metadata = json.load(f)
             
             # Add new metadata
             existing_metadata.append(metadata)
@@ -324,11 +351,19 @@ class UltraStarWriter:
             if len(existing_metadata) > 100:
                 existing_metadata = existing_metadata[-100:]
             
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_metadata, f, indent=2, ensure_ascii=False)
+            if ORJSON_AVAILABLE:
+                with open(metadata_file, 'wb') as f:
+                    f.write(orjson.dumps(existing_metadata, option=orjson.OPT_INDENT_2))
+            else:
+                with open(metadata_file, 'w', encoding='utf-8') as f:
+                    json.dump(existing_metadata, f, indent=2, ensure_ascii=False)
+            with open(hash_file, 'w', encoding='utf-8') as f:
+                f.write(content_hash)
+            return True
                 
         except Exception as e:
             print(f"{ULTRASINGER_HEAD} {red_highlighted('Failed to save metadata:')} {e}")
+            return False
 
 
 def format_separated_string(data: str) -> str:
@@ -3,19 +3,79 @@ Sistema abrangente de validação e conversão de formatos de entrada
 Suporta múltiplos formatos de áudio e validação robusta
 """
 
+import asyncio
 import os
 import re
 import mimetypes
+import shutil
 from typing import List, Dict, Optional, Tuple, Any
 from pathlib import Path
 from urllib.parse import urlparse
 import subprocess
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from modules.console_colors import ULTRASINGER_HEAD, red_highlighted, green_highlighted, blue_highlighted
 from modules.error_handler import ErrorHandler, ErrorCategory, ErrorSeverity
 
 
+# Assinaturas de formatos de áudio no início do arquivo
+_AUDIO_SIGNATURES = (
+    (b'fLaC', '.flac'),
+    (b'OggS', '.ogg'),
+    ((b'ID3', b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'), '.mp3'),
+)
+_AUDIO_HEADER_SIZE = 16
+# O_NOATIME (Linux) evita atualizar o atime a cada leitura; O_BINARY só existe no Windows
+_HEADER_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_NOATIME', 0)
+
+
+@lru_cache(maxsize=1024)
+def _sniff_audio_format(file_path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """Identificar o formato pelos primeiros bytes; mtime e tamanho invalidam o cache"""
+    try:
+        # os.open/os.read evitam o BufferedReader de open() para ler só o cabeçalho
+        try:
+            fd = os.open(file_path, _HEADER_OPEN_FLAGS)
+        except PermissionError:
+            # O_NOATIME exige ser dono do arquivo
+            fd = os.open(file_path, _HEADER_OPEN_FLAGS & ~getattr(os, 'O_NOATIME', 0))
+        try:
+            header = os.read(fd, _AUDIO_HEADER_SIZE)
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+    
+    if header.startswith(b'RIFF') and header[8:12] == b'WAVE':
+        return '.wav'
+    if header[4:8] == b'ftyp':
+        return '.m4a'
+    for signature, ext in _AUDIO_SIGNATURES:
+        if header.startswith(signature):
+            return ext
+    return None
+
+
+# Tags do cabeçalho UltraStar (#TAG:valor), lidas em uma única passada pelo arquivo
+_ULTRASTAR_TAG_RE = re.compile(r'^#(\w+):(.*)$', re.MULTILINE)
+_ULTRASTAR_NOTE_RE = re.compile(r'^[:\*F] ', re.MULTILINE)
+
+# Campos de format_info extraídos do cabeçalho UltraStar
+_ULTRASTAR_INFO_TAGS = ('title', 'artist', 'mp3', 'bpm', 'language', 'genre', 'year')
+
+
+def _parse_ultrastar_tags(content: str) -> Dict[str, str]:
+    """Mapear as tags do cabeçalho (em maiúsculas) para seus valores; a primeira ocorrência prevalece"""
+    tags = {}
+    for name, value in _ULTRASTAR_TAG_RE.findall(content):
+        if value:
+            tags.setdefault(name.upper(), value)
+    return tags
+
+
 class FormatValidator:
     """Validador abrangente de formatos de entrada"""
     
@@ -131,10 +191,14 @@ class FormatValidator:
     
     def _is_youtube_url(self, url: str) -> bool:
         """Verificar se é URL do YouTube"""
-        for pattern in self.YOUTUBE_URL_PATTERNS:
-            if re.match(pattern, url, re.IGNORECASE):
-                return True
-        return False
+        return self._match_youtube_url(url) is not None
+    
+    @staticmethod
+    def _match_youtube_url(url: str) -> Optional[re.Match]:
+        """Casar a URL com os padrões do YouTube (teste de substring antes da regex)"""
+        if 'youtu' not in url.lower():
+            return None
+        return _YOUTUBE_URL_RE.match(url)
     
     def _validate_youtube_url(self, url: str) -> Dict[str, Any]:
         """Validar URL do YouTube"""
@@ -147,12 +211,9 @@ class FormatValidator:
         }
         
         # Extrair ID do vídeo
-        video_id = None
-        for pattern in self.YOUTUBE_URL_PATTERNS:
-            match = re.match(pattern, url, re.IGNORECASE)
-            if match:
-                video_id = match.group(1)
-                break
+        match = self._match_youtube_url(url)
+        # Só a alternativa que casou tem grupo preenchido: o último grupo casado é o ID do vídeo
+        video_id = match.group(match.lastindex) if match else None
         
         if video_id:
             result['is_valid'] = True
@@ -179,16 +240,12 @@ class FormatValidator:
             return result
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = Path(file_path).read_text(encoding='utf-8')
+            tags = _parse_ultrastar_tags(content)
             
             # Verificar tags obrigatórias
-            required_tags = ['#TITLE:', '#ARTIST:', '#MP3:', '#BPM:']
-            missing_tags = []
-            
-            for tag in required_tags:
-                if tag not in content:
-                    missing_tags.append(tag)
+            required_tags = ('TITLE', 'ARTIST', 'MP3', 'BPM')
+            missing_tags = [f"#{tag}:" for tag in required_tags if tag not in tags]
             
             if missing_tags:
                 result['errors'].extend([f"Tag obrigatória ausente: {tag}" for tag in missing_tags])
@@ -196,7 +253,7 @@ class FormatValidator:
                 result['is_valid'] = True
                 
             # Extrair informações do arquivo
-            result['format_info'] = self._extract_ultrastar_info(content)
+            result['format_info'] = self._extract_ultrastar_info(content, tags)
             
         except UnicodeDecodeError:
             result['errors'].append("Erro de codificação do arquivo")
@@ -253,29 +310,15 @@ class FormatValidator:
         
         return result
     
-    def _extract_ultrastar_info(self, content: str) -> Dict[str, Any]:
+    def _extract_ultrastar_info(self, content: str, tags: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Extrair informações do arquivo UltraStar"""
-        info = {}
-        
-        # Padrões para extrair tags
-        tag_patterns = {
-            'title': r'#TITLE:(.+)',
-            'artist': r'#ARTIST:(.+)',
-            'mp3': r'#MP3:(.+)',
-            'bpm': r'#BPM:(.+)',
-            'language': r'#LANGUAGE:(.+)',
-            'genre': r'#GENRE:(.+)',
-            'year': r'#YEAR:(.+)'
-        }
+        if tags is None:
+            tags = _parse_ultrastar_tags(content)
         
-        for key, pattern in tag_patterns.items():
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                info[key] = match.group(1).strip()
+        info = {key: tags[key.upper()].strip() for key in _ULTRASTAR_INFO_TAGS if key.upper() in tags}
         
         # Contar notas
-        note_lines = re.findall(r'^[:\*F] ', content, re.MULTILINE)
-        info['note_count'] = len(note_lines)
+        info['note_count'] = len(_ULTRASTAR_NOTE_RE.findall(content))
         
         return info
     
@@ -329,51 +372,105 @@ class FormatValidator:
         return suggestions
     
     def validate_batch_files(self, file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
-        """Validar múltiplos arquivos em lote"""
-        results = {}
+        """Validar múltiplos arquivos em lote
         
-        for file_path in file_paths:
-            results[file_path] = self.validate_input_file(file_path)
+        A validação é dominada por I/O (leitura de arquivos, ffprobe), então os
+        arquivos são validados em paralelo por um pool de threads.
+        """
+        if not file_paths:
+            return {}
         
-        return results
+        with ThreadPoolExecutor(max_workers=min(32, len(file_paths))) as executor:
+            return dict(zip(file_paths, executor.map(self.validate_input_file, file_paths)))
     
     def get_format_statistics(self, file_paths: List[str]) -> Dict[str, Any]:
         """Obter estatísticas dos formatos dos arquivos"""
-        stats = {
-            'total_files': len(file_paths),
-            'valid_files': 0,
-            'invalid_files': 0,
-            'format_distribution': {},
-            'file_types': {'audio': 0, 'ultrastar': 0, 'youtube_url': 0},
-            'total_size': 0,
-            'average_size': 0
-        }
-        
-        sizes = []
-        
-        for file_path in file_paths:
-            result = self.validate_input_file(file_path)
-            
-            if result['is_valid']:
-                stats['valid_files'] += 1
-                
-                file_type = result['file_type']
-                stats['file_types'][file_type] += 1
-                
-                if file_type == 'audio':
-                    ext = result['format_info'].get('extension', 'unknown')
-                    stats['format_distribution'][ext] = stats['format_distribution'].get(ext, 0) + 1
-                    
-                    file_size = result['format_info'].get('file_size', 0)
-                    sizes.append(file_size)
-                    stats['total_size'] += file_size
-            else:
-                stats['invalid_files'] += 1
+        validated = self.validate_batch_files(file_paths)
+        results = [validated[file_path] for file_path in file_paths]
+        valid_results = [result for result in results if result['is_valid']]
+        audio_infos = [result['format_info'] for result in valid_results if result['file_type'] == 'audio']
         
-        if sizes:
-            stats['average_size'] = sum(sizes) / len(sizes)
+        sizes = [info.get('file_size', 0) for info in audio_infos]
+        file_types = Counter(result['file_type'] for result in valid_results)
         
-        return stats
+        return {
+            'total_files': len(file_paths),
+            'valid_files': len(valid_results),
+            'invalid_files': len(results) - len(valid_results),
+            'format_distribution': dict(Counter(info.get('extension', 'unknown') for info in audio_infos)),
+            'file_types': {'audio': 0, 'ultrastar': 0, 'youtube_url': 0, **file_types},
+            'total_size': sum(sizes),
+            'average_size': sum(sizes) / len(sizes) if sizes else 0
+        }
+
+
+# FormatValidator.YOUTUBE_URL_PATTERNS compilados em uma única regex (cada alternativa captura o ID do vídeo)
+_YOUTUBE_URL_RE = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in FormatValidator.YOUTUBE_URL_PATTERNS),
+    re.IGNORECASE
+)
+
+
+# Mantém o stderr do ffmpeg restrito a mensagens de erro
+_FFMPEG_QUIET_ARGS = ('-hide_banner', '-nostats', '-loglevel', 'error')
+
+
+def _ffmpeg_thread_args(threads: Optional[int]) -> Tuple[List[str], List[str]]:
+    """Argumentos globais e de saída que limitam as threads de um ffmpeg
+    
+    Em conversões paralelas cada ffmpeg usaria todos os núcleos por padrão;
+    limitar codec e filtros evita a disputa entre os processos.
+    """
+    if not threads:
+        return [], []
+    value = str(threads)
+    return ['-filter_threads', value, '-filter_complex_threads', value], ['-threads', value]
+
+
+@lru_cache(maxsize=1)
+def _is_ffmpeg_available() -> bool:
+    """Verificar uma única vez se o ffmpeg está no PATH (sem iniciar um processo)"""
+    return shutil.which('ffmpeg') is not None
+
+
+@lru_cache(maxsize=1)
+def _get_ffmpeg_version() -> Optional[str]:
+    """Ler uma única vez a versão do ffmpeg"""
+    try:
+        result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            # Extrair versão da primeira linha
+            first_line = result.stdout.split('\n')[0]
+            version_match = re.search(r'ffmpeg version ([^\s]+)', first_line)
+            if version_match:
+                return version_match.group(1)
+        return None
+    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def _batch_output_files(input_files: List[str], output_dir: str, target_format: str) -> List[str]:
+    """Caminhos de saída do lote, um distinto por entrada
+    
+    Entradas com o mesmo nome-base (ex.: musica.wav e musica.flac) recebem a extensão
+    original no nome (musica_wav.mp3, musica_flac.mp3); colisões restantes ganham um contador.
+    """
+    stem_counts = Counter(Path(input_file).stem for input_file in input_files)
+    used_names = set()
+    output_files = []
+    for input_file in input_files:
+        path = Path(input_file)
+        base_name = path.stem
+        if stem_counts[base_name] > 1 and path.suffix:
+            base_name = f"{base_name}_{path.suffix[1:].lower()}"
+        name = base_name
+        counter = 2
+        while name in used_names:
+            name = f"{base_name}_{counter}"
+            counter += 1
+        used_names.add(name)
+        output_files.append(os.path.join(output_dir, f"{name}.{target_format}"))
+    return output_files
 
 
 class FormatConverter:
@@ -382,9 +479,47 @@ class FormatConverter:
     def __init__(self, error_handler: Optional[ErrorHandler] = None):
         self.error_handler = error_handler or ErrorHandler()
     
+    # Parâmetros do ffmpeg por formato alvo e qualidade
+    FFMPEG_QUALITY_SETTINGS = {
+        'mp3': {
+            'low': ['-b:a', '128k'],
+            'medium': ['-b:a', '192k'],
+            'high': ['-b:a', '320k'],
+            'lossless': ['-b:a', '320k']  # MP3 não é lossless
+        },
+        'wav': {
+            'low': ['-ar', '22050'],
+            'medium': ['-ar', '44100'],
+            'high': ['-ar', '48000'],
+            'lossless': ['-ar', '48000', '-sample_fmt', 's32']
+        },
+        'flac': {
+            'low': ['-compression_level', '0'],
+            'medium': ['-compression_level', '5'],
+            'high': ['-compression_level', '8'],
+            'lossless': ['-compression_level', '12']
+        }
+    }
+    
+    def _build_ffmpeg_command(self, input_file: str, output_file: str, target_format: str,
+                              quality: str, threads: Optional[int] = None) -> List[str]:
+        """Montar o comando ffmpeg de uma conversão simples"""
+        global_args, output_args = _ffmpeg_thread_args(threads)
+        # Só erros no stderr, sem banner nem estatísticas de progresso
+        cmd = ['ffmpeg', *_FFMPEG_QUIET_ARGS, *global_args, '-i', input_file, '-y']
+        
+        format_settings = self.FFMPEG_QUALITY_SETTINGS.get(target_format, {})
+        if quality in format_settings:
+            cmd.extend(format_settings[quality])
+        
+        cmd.extend(output_args)
+        cmd.append(output_file)
+        return cmd
+    
     def convert_to_supported_format(self, input_file: str, output_file: str, 
                                   target_format: str = 'mp3', 
-                                  quality: str = 'high') -> bool:
+                                  quality: str = 'high',
+                                  threads: Optional[int] = None) -> bool:
         """
         Converter arquivo para formato suportado
         
@@ -393,37 +528,10 @@ class FormatConverter:
             output_file: Arquivo de saída
             target_format: Formato alvo (mp3, wav, flac)
             quality: Qualidade (low, medium, high, lossless)
+            threads: Limite de threads do ffmpeg (None usa o padrão do ffmpeg)
         """
         try:
-            # Configurações de qualidade
-            quality_settings = {
-                'mp3': {
-                    'low': ['-b:a', '128k'],
-                    'medium': ['-b:a', '192k'],
-                    'high': ['-b:a', '320k'],
-                    'lossless': ['-b:a', '320k']  # MP3 não é lossless
-                },
-                'wav': {
-                    'low': ['-ar', '22050'],
-                    'medium': ['-ar', '44100'],
-                    'high': ['-ar', '48000'],
-                    'lossless': ['-ar', '48000', '-sample_fmt', 's32']
-                },
-                'flac': {
-                    'low': ['-compression_level', '0'],
-                    'medium': ['-compression_level', '5'],
-                    'high': ['-compression_level', '8'],
-                    'lossless': ['-compression_level', '12']
-                }
-            }
-            
-            # Construir comando ffmpeg
-            cmd = ['ffmpeg', '-i', input_file, '-y']
-            
-            if target_format in quality_settings and quality in quality_settings[target_format]:
-                cmd.extend(quality_settings[target_format][quality])
-            
-            cmd.append(output_file)
+            cmd = self._build_ffmpeg_command(input_file, output_file, target_format, quality, threads)
             
             # Executar conversão
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
@@ -445,57 +553,29 @@ class FormatConverter:
             return False
     
     def is_ffmpeg_available(self) -> bool:
-        """Verificar se ffmpeg está disponível"""
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=10)
-            return True
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        """Verificar se ffmpeg está disponível (resultado em cache por processo)"""
+        return _is_ffmpeg_available()
     
     def get_ffmpeg_version(self) -> Optional[str]:
-        """Obter versão do ffmpeg"""
-        try:
-            result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                # Extrair versão da primeira linha
-                first_line = result.stdout.split('\n')[0]
-                version_match = re.search(r'ffmpeg version ([^\s]+)', first_line)
-                if version_match:
-                    return version_match.group(1)
-            return None
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            return None
+        """Obter versão do ffmpeg (resultado em cache por processo)"""
+        return _get_ffmpeg_version()
     
     def detect_audio_format(self, file_path: str) -> Optional[str]:
-        """Detectar formato de áudio do arquivo"""
-        if not os.path.exists(file_path):
-            return None
+        """Detectar formato de áudio do arquivo
         
-        # Primeiro, tentar pela extensão
-        ext = Path(file_path).suffix.lower()
-        if ext:
-            return ext
-        
-        # Se não há extensão, tentar detectar pelo conteúdo
+        O formato é identificado pela assinatura nos primeiros bytes do arquivo;
+        a extensão só é usada quando o conteúdo não é reconhecido.
+        """
         try:
-            with open(file_path, 'rb') as f:
-                header = f.read(12)
-            
-            # Verificar assinaturas de arquivo
-            if header.startswith(b'RIFF') and b'WAVE' in header:
-                return '.wav'
-            elif header.startswith(b'ID3') or header[0:2] == b'\xff\xfb':
-                return '.mp3'
-            elif header.startswith(b'fLaC'):
-                return '.flac'
-            elif header.startswith(b'OggS'):
-                return '.ogg'
-            elif header[4:8] == b'ftyp':
-                return '.m4a'
-        except:
-            pass
+            st = os.stat(file_path)
+        except OSError:
+            return None
         
-        return None
+        detected = _sniff_audio_format(file_path, st.st_mtime_ns, st.st_size)
+        if detected:
+            return detected
+        
+        return Path(file_path).suffix.lower() or None
     
     def is_format_supported(self, format_ext: str) -> bool:
         """Verificar se formato é suportado"""
@@ -595,12 +675,18 @@ class FormatConverter:
         return source_lower in metadata_formats and target_lower in metadata_formats
     
     def build_conversion_command(self, input_file: str, output_file: str, 
-                               quality: str, metadata: Optional[Dict[str, str]] = None) -> Optional[List[str]]:
-        """Construir comando de conversão com metadados"""
+                               quality: str, metadata: Optional[Dict[str, str]] = None,
+                               threads: Optional[int] = None) -> Optional[List[str]]:
+        """Construir comando de conversão com metadados
+        
+        threads limita as threads do ffmpeg; use 1 quando vários comandos
+        forem executados em paralelo.
+        """
         if not self.is_ffmpeg_available():
             return None
         
-        cmd = ['ffmpeg', '-i', input_file, '-y']
+        global_args, output_args = _ffmpeg_thread_args(threads)
+        cmd = ['ffmpeg', *_FFMPEG_QUIET_ARGS, *global_args, '-i', input_file, '-y']
         
         # Adicionar parâmetros de qualidade
         target_ext = Path(output_file).suffix.lower()
@@ -630,39 +716,90 @@ class FormatConverter:
                 if key in metadata_map and value:
                     cmd.extend(['-metadata', f'{metadata_map[key]}={value}'])
         
+        cmd.extend(output_args)
         cmd.append(output_file)
         return cmd
     
-    def convert_batch_files(self, input_files: List[str], output_dir: str, 
-                          target_format: str, quality: str = 'medium') -> List[Dict[str, Any]]:
-        """Converter múltiplos arquivos em lote"""
-        results = []
-        
-        os.makedirs(output_dir, exist_ok=True)
+    async def _convert_one_async(self, input_file: str, output_file: str,
+                                 target_format: str, quality: str) -> Dict[str, Any]:
+        """Converter um arquivo com um processo ffmpeg assíncrono"""
+        result = {
+            'input_file': input_file,
+            'output_file': output_file,
+            'success': False,
+            'error': None
+        }
         
-        for input_file in input_files:
-            input_path = Path(input_file)
-            output_file = os.path.join(output_dir, f"{input_path.stem}.{target_format}")
-            
-            result = {
-                'input_file': input_file,
-                'output_file': output_file,
-                'success': False,
-                'error': None
-            }
-            
+        cmd = self._build_ffmpeg_command(input_file, output_file, target_format, quality, threads=1)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+            )
             try:
-                success = self.convert_to_supported_format(
-                    input_file, output_file, target_format, quality
-                )
-                result['success'] = success
-                
-                if not success:
-                    result['error'] = "Conversão falhou"
-                    
-            except Exception as e:
-                result['error'] = str(e)
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=300)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
             
-            results.append(result)
+            if proc.returncode == 0:
+                print(f"{ULTRASINGER_HEAD} {green_highlighted('Conversão concluída:')} {output_file}")
+                result['success'] = True
+            else:
+                print(f"{ULTRASINGER_HEAD} {red_highlighted('Erro na conversão:')} {stderr.decode(errors='replace')}")
+                result['error'] = "Conversão falhou"
+                
+        except Exception as e:
+            self.error_handler.handle_error(
+                e,
+                ErrorCategory.FILE_IO,
+                ErrorSeverity.HIGH,
+                "FormatConverter"
+            )
+            result['error'] = str(e) or type(e).__name__
+        
+        return result
+    
+    async def convert_batch_async(self, input_files: List[str], output_dir: str,
+                                  target_format: str, quality: str = 'medium',
+                                  max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Converter múltiplos arquivos em lote com processos ffmpeg concorrentes
+        
+        No máximo max_workers conversões (padrão os.cpu_count()) rodam ao mesmo
+        tempo, cada ffmpeg limitado a uma thread para não disputar os núcleos.
+        Entradas com o mesmo nome-base recebem saídas distintas, para que dois
+        ffmpeg nunca escrevam o mesmo arquivo ao mesmo tempo.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(max_workers or os.cpu_count() or 1)
+        
+        async def convert_limited(input_file: str, output_file: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._convert_one_async(input_file, output_file, target_format, quality)
         
-        return results
\ No newline at end of file
+        output_files = _batch_output_files(input_files, output_dir, target_format)
+        return list(await asyncio.gather(*(
+            convert_limited(input_file, output_file)
+            for input_file, output_file in zip(input_files, output_files)
+        )))
+    
+    def convert_batch_files(self, input_files: List[str], output_dir: str, 
+                          target_format: str, quality: str = 'medium',
+                          max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Converter múltiplos arquivos em lote (versão síncrona de convert_batch_async)
+        
+        Não pode ser chamada de dentro de um event loop em execução (asyncio.run
+        não aninha loops); nesse caso use await convert_batch_async(...).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass  # Nenhum loop ativo: seguro iniciar um com asyncio.run
+        else:
+            raise RuntimeError(
+                "convert_batch_files não pode ser chamada com um event loop em execução; "
+                "use await convert_batch_async(...)"
+            )
+        return asyncio.run(
+            self.convert_batch_async(input_files, output_dir, target_format, quality, max_workers)
+        )
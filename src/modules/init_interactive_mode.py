@@ -10,13 +10,21 @@ from modules.Speech_Recognition.Whisper import WhisperModel
 from modules.DeviceDetection.device_detection import check_gpu_support
 from modules.console_colors import green_highlighted, red_highlighted, yellow_highlighted, blue_highlighted
 
+import mmap
 import os
 import sys
 import time
 import urllib.parse
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 def get_input_file(console, settings, header):
     while True:
@@ -178,27 +186,77 @@ def configure_additional_options(console, settings, header):
         if ffmpeg_path:
             settings.ffmpeg_path = ffmpeg_path
 
+# Detalhes estáticos dos modelos exibidos na seleção, montados uma única vez
+_MODEL_DETAILS = {
+    "Whisper": {
+        "tiny": {"quality": "Baixa", "speed": "Muito Rápida", "memory": "~1GB"},
+        "base": {"quality": "Média", "speed": "Rápida", "memory": "~1GB"},
+        "small": {"quality": "Boa", "speed": "Média", "memory": "~2GB"},
+        "medium": {"quality": "Muito Boa", "speed": "Lenta", "memory": "~5GB"},
+        "large": {"quality": "Excelente", "speed": "Muito Lenta", "memory": "~10GB"},
+        "large-v2": {"quality": "Excelente+", "speed": "Muito Lenta", "memory": "~10GB"},
+        "large-v3": {"quality": "Superior", "speed": "Muito Lenta", "memory": "~10GB"},
+        "large-v3-turbo": {"quality": "Superior", "speed": "Ultra Rápida", "memory": "~6GB"}
+    },
+    "Demucs": {
+        "htdemucs": {"quality": "Excelente", "speed": "Lenta", "memory": "~8GB"},
+        "htdemucs_ft": {"quality": "Superior", "speed": "Muito Lenta", "memory": "~10GB"},
+        "htdemucs_6s": {"quality": "Boa", "speed": "Média", "memory": "~6GB"},
+        "hdemucs_mmi": {"quality": "Muito Boa", "speed": "Lenta", "memory": "~8GB"},
+        "mdx": {"quality": "Boa", "speed": "Rápida", "memory": "~4GB"},
+        "mdx_extra": {"quality": "Muito Boa", "speed": "Média", "memory": "~6GB"}
+    }
+}
+
+# Visões somente leitura entregues por _get_model_details, para que ninguém altere a tabela compartilhada
+# (os detalhes de cada modelo também são embrulhados, não só o primeiro nível)
+_MODEL_DETAILS_VIEWS = {
+    model_type: MappingProxyType({model: MappingProxyType(info) for model, info in details.items()})
+    for model_type, details in _MODEL_DETAILS.items()
+}
+_NO_MODEL_DETAILS = MappingProxyType({})
+
+# Abaixo deste tamanho ler o cache direto é mais barato que mapeá-lo na memória
+_CACHE_MMAP_MIN_SIZE = 4096
+
+# Valor salvo no cache -> membro do enum
+_WHISPER_BY_VALUE = {model.value: model for model in WhisperModel}
+_DEMUCS_BY_VALUE = {model.value: model for model in DemucsModel}
+
 class InteractiveMode:
     """Classe para gerenciar o modo interativo do UltraSinger"""
 
-    def __init__(self):
-        self.console = Console()
+    __slots__ = ('console', 'header', 'settings_cache_file', '_cache_memo', '_welcome_renderable')
+
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or Console()
         self.header = "[bold green][UltraSinger][/bold green]"
         self.settings_cache_file = "interactive_settings_cache.json"
+        # Último cache lido ou salvo, como (caminho do arquivo, dados)
+        self._cache_memo = None
 
-    def display_welcome(self):
-        """Exibe a tela de boas-vindas"""
+        # Painel de boas-vindas montado uma única vez e reaproveitado a cada exibição
         welcome_text = Text()
         welcome_text.append("🎵 UltraSinger Interactive Mode 🎵\n", style="bold magenta")
         welcome_text.append("Transforme áudio em arquivos UltraStar com IA!", style="cyan")
-
-        panel = Panel(
+        self._welcome_renderable = Panel(
             welcome_text,
             title="Bem-vindo",
             border_style="green",
             padding=(1, 2)
         )
-        self.console.print(panel)
+
+    def _ask_str(self, *args, **kwargs) -> str:
+        """Pergunta com resposta em texto (ponto único para substituir nos testes)"""
+        return Prompt.ask(*args, **kwargs)
+
+    def _ask_bool(self, *args, **kwargs) -> bool:
+        """Pergunta de sim/não (ponto único para substituir nos testes)"""
+        return Confirm.ask(*args, **kwargs)
+
+    def display_welcome(self):
+        """Exibe a tela de boas-vindas"""
+        self.console.print(self._welcome_renderable)
 
     def validate_file_path(self, file_path: str) -> bool:
         """Valida se o caminho do arquivo existe"""
@@ -236,7 +294,7 @@ class InteractiveMode:
         self.console.print("[dim]Também aceita: URLs do YouTube, arquivos UltraStar.txt[/dim]\n")
 
         while True:
-            input_file = Prompt.ask(
+            input_file = self._ask_str(
                 f"{self.header} Caminho do arquivo",
                 default="",
                 show_default=False
@@ -283,7 +341,7 @@ class InteractiveMode:
         else:
             default_output = os.path.join(os.path.dirname(settings.input_file_path), "output")
 
-        output_folder = Prompt.ask(
+        output_folder = self._ask_str(
             f"{self.header} Pasta de saída",
             default=default_output
         ).strip()
@@ -332,7 +390,7 @@ class InteractiveMode:
                 self.console.print(f"[bright_green]{idx}.[/bright_green] {model.value}")
 
         while True:
-            choice = Prompt.ask(
+            choice = self._ask_str(
                 f"\n{self.header} Escolha o modelo {model_type}",
                 default=str(models.index(default_model) + 1),
                 show_default=True
@@ -345,29 +403,9 @@ class InteractiveMode:
             else:
                 self.console.print(f"{self.header} [bold red]Erro:[/bold red] Escolha inválida. Digite um número de 1 a {len(models)}.\n")
 
-    def _get_model_details(self, model_type: str) -> Dict[str, Dict[str, str]]:
-        """Retorna detalhes dos modelos"""
-        if model_type == "Whisper":
-            return {
-                "tiny": {"quality": "Baixa", "speed": "Muito Rápida", "memory": "~1GB"},
-                "base": {"quality": "Média", "speed": "Rápida", "memory": "~1GB"},
-                "small": {"quality": "Boa", "speed": "Média", "memory": "~2GB"},
-                "medium": {"quality": "Muito Boa", "speed": "Lenta", "memory": "~5GB"},
-                "large": {"quality": "Excelente", "speed": "Muito Lenta", "memory": "~10GB"},
-                "large-v2": {"quality": "Excelente+", "speed": "Muito Lenta", "memory": "~10GB"},
-                "large-v3": {"quality": "Superior", "speed": "Muito Lenta", "memory": "~10GB"},
-                "large-v3-turbo": {"quality": "Superior", "speed": "Ultra Rápida", "memory": "~6GB"}
-            }
-        elif model_type == "Demucs":
-            return {
-                "htdemucs": {"quality": "Excelente", "speed": "Lenta", "memory": "~8GB"},
-                "htdemucs_ft": {"quality": "Superior", "speed": "Muito Lenta", "memory": "~10GB"},
-                "htdemucs_6s": {"quality": "Boa", "speed": "Média", "memory": "~6GB"},
-                "hdemucs_mmi": {"quality": "Muito Boa", "speed": "Lenta", "memory": "~8GB"},
-                "mdx": {"quality": "Boa", "speed": "Rápida", "memory": "~4GB"},
-                "mdx_extra": {"quality": "Muito Boa", "speed": "Média", "memory": "~6GB"}
-            }
-        return {}
+    def _get_model_details(self, model_type: str) -> Mapping[str, Mapping[str, str]]:
+        """Retorna detalhes dos modelos (somente leitura)"""
+        return _MODEL_DETAILS_VIEWS.get(model_type, _NO_MODEL_DETAILS)
 
     def configure_processing_jobs(self, settings: Settings) -> None:
         """Configurar quais jobs de processamento serão executados"""
@@ -419,7 +457,7 @@ class InteractiveMode:
         self.console.print()
 
         # Perguntar se quer personalizar ou usar padrão
-        use_custom = Confirm.ask(
+        use_custom = self._ask_bool(
             f"{self.header} Personalizar jobs de processamento?",
             default=False
         )
@@ -440,13 +478,13 @@ class InteractiveMode:
         self.console.print(f"\n{self.header} [bold cyan]Configuração Personalizada de Jobs[/bold cyan]\n")
 
         # 1. Separação Vocal
-        settings.use_separated_vocal = Confirm.ask(
+        settings.use_separated_vocal = self._ask_bool(
             "🎤 Executar separação vocal com Demucs?",
             default=True
         )
 
         # 2. Transcrição
-        use_transcription = Confirm.ask(
+        use_transcription = self._ask_bool(
             "📝 Executar transcrição com Whisper?",
             default=True
         )
@@ -458,7 +496,7 @@ class InteractiveMode:
             settings.ignore_audio = False
 
         # 3. Detecção de Pitch
-        settings.use_pitch_detection = Confirm.ask(
+        settings.use_pitch_detection = self._ask_bool(
             "🎵 Executar detecção de pitch com Crepe?",
             default=True
         )
@@ -466,32 +504,32 @@ class InteractiveMode:
         if not settings.use_pitch_detection:
             self.console.print("[yellow]⚠ Aviso:[/yellow] Pitch detection é essencial para qualidade. Continuando sem ela...")
             self.console.print("[yellow]⚠ Aviso:[/yellow] Sem pitch detection, a geração de arquivos pode ser limitada")        # 4. Geração de MIDI
-        settings.create_midi = Confirm.ask(
+        settings.create_midi = self._ask_bool(
             "🎹 Gerar arquivo MIDI?",
             default=False
         )
 
         # 5. Geração de Gráficos
-        settings.create_plot = Confirm.ask(
+        settings.create_plot = self._ask_bool(
             "📊 Gerar gráficos de visualização?",
             default=False
         )
 
         # 6. Hifenização
-        settings.hyphenation = Confirm.ask(
+        settings.hyphenation = self._ask_bool(
             "✂️ Aplicar hifenização nas letras?",
             default=True
         )
 
         # 7. Partitura
-        create_sheet = Confirm.ask(
+        create_sheet = self._ask_bool(
             "🎼 Gerar partitura em PDF? (requer MuseScore instalado)",
             default=False
         )
         settings.create_sheet = create_sheet
 
         if create_sheet and not settings.musescore_path:
-            musescore_path = Prompt.ask(
+            musescore_path = self._ask_str(
                 "Caminho do executável do MuseScore",
                 default=""
             ).strip()
@@ -501,13 +539,13 @@ class InteractiveMode:
                 self.console.print("[yellow]⚠ Aviso:[/yellow] Caminho do MuseScore inválido. Partitura não será gerada.")
 
         # 8. Audio chunks (opcional)
-        settings.create_audio_chunks = Confirm.ask(
+        settings.create_audio_chunks = self._ask_bool(
             "🔊 Criar chunks de áudio separados?",
             default=False
         )
 
         # 9. Karaoke
-        settings.create_karaoke = Confirm.ask(
+        settings.create_karaoke = self._ask_bool(
             "🎤 Criar arquivo de karaokê?",
             default=True
         )
@@ -539,7 +577,7 @@ class InteractiveMode:
 
     def configure_advanced_options_enhanced(self, settings: Settings) -> None:
         """Configuração de opções avançadas aprimorada"""
-        if not Confirm.ask(f"\n{self.header} Configurar opções avançadas?", default=False):
+        if not self._ask_bool(f"\n{self.header} Configurar opções avançadas?", default=False):
             return
 
         self.console.print(f"\n{self.header} [bold underline]Configurações Avançadas[/bold underline]\n")
@@ -564,20 +602,20 @@ class InteractiveMode:
         self.console.print("[bold cyan]Opções de Processamento:[/bold cyan]")
 
         # Separação vocal
-        settings.use_separated_vocal = Confirm.ask(
+        settings.use_separated_vocal = self._ask_bool(
             "Usar separação vocal (Demucs)?",
             default=True
         )
 
         # Transcrição com Whisper
-        use_whisper = Confirm.ask(
+        use_whisper = self._ask_bool(
             "Usar transcrição com Whisper?",
             default=True
         )
 
         if use_whisper:
             # Whisper batch size
-            batch_size = Prompt.ask(
+            batch_size = self._ask_str(
                 "Tamanho do batch do Whisper",
                 default="16"
             )
@@ -587,7 +625,7 @@ class InteractiveMode:
             # Whisper compute type
             compute_types = ["float16", "float32", "int8"]
             self.console.print(f"Tipos de computação disponíveis: {', '.join(compute_types)}")
-            compute_type = Prompt.ask(
+            compute_type = self._ask_str(
                 "Tipo de computação do Whisper",
                 default="float16" if not getattr(settings, 'force_cpu', False) else "int8",
                 choices=compute_types
@@ -599,14 +637,14 @@ class InteractiveMode:
             settings.ignore_audio = True
 
         # Detecção de pitch com Crepe
-        use_crepe = Confirm.ask(
+        use_crepe = self._ask_bool(
             "Usar detecção de pitch com Crepe?",
             default=True
         )
 
         if use_crepe:
             # Crepe step size
-            step_size = Prompt.ask(
+            step_size = self._ask_str(
                 "Step size do Crepe (ms) - menor = mais preciso mas mais lento",
                 default="10"
             )
@@ -616,7 +654,7 @@ class InteractiveMode:
             # Crepe model capacity
             crepe_models = ["tiny", "small", "medium", "large", "full"]
             self.console.print(f"Modelos Crepe disponíveis: {', '.join(crepe_models)}")
-            crepe_model = Prompt.ask(
+            crepe_model = self._ask_str(
                 "Modelo Crepe",
                 default="full",
                 choices=crepe_models
@@ -627,7 +665,7 @@ class InteractiveMode:
             # Ainda executar mas com configurações mínimas
 
         # Manter cache
-        settings.keep_cache = Confirm.ask(
+        settings.keep_cache = self._ask_bool(
             "Manter cache após execução?",
             default=False
         )
@@ -641,7 +679,7 @@ class InteractiveMode:
 
         format_versions = ["0.3.0", "1.0.0", "1.1.0", "1.2.0"]
         self.console.print(f"Versões de formato UltraStar disponíveis: {', '.join(format_versions)}")
-        format_choice = Prompt.ask(
+        format_choice = self._ask_str(
             "Versão do formato UltraStar.txt",
             default="1.2.0",
             choices=format_versions
@@ -667,11 +705,11 @@ class InteractiveMode:
         else:
             self.console.print("[yellow]⚠[/yellow] GPU não detectada, usando CPU")
 
-        settings.force_cpu = Confirm.ask("Forçar uso de CPU?", default=not gpu_available)
+        settings.force_cpu = self._ask_bool("Forçar uso de CPU?", default=not gpu_available)
 
         if not settings.force_cpu and gpu_available:
-            settings.force_whisper_cpu = Confirm.ask("Forçar Whisper na CPU?", default=False)
-            settings.force_crepe_cpu = Confirm.ask("Forçar Crepe na CPU?", default=False)
+            settings.force_whisper_cpu = self._ask_bool("Forçar Whisper na CPU?", default=False)
+            settings.force_crepe_cpu = self._ask_bool("Forçar Crepe na CPU?", default=False)
         else:
             settings.force_whisper_cpu = True
             settings.force_crepe_cpu = True
@@ -704,7 +742,7 @@ class InteractiveMode:
         for code, name in common_languages.items():
             self.console.print(f"  [cyan]{code}[/cyan]: {name}")
 
-        language = Prompt.ask(
+        language = self._ask_str(
             "Código do idioma",
             default="auto"
         ).strip().lower()
@@ -713,7 +751,7 @@ class InteractiveMode:
             settings.language = language
 
         # Números como numerais
-        settings.keep_numbers = Confirm.ask(
+        settings.keep_numbers = self._ask_bool(
             "Transcrever números como numerais?",
             default=False
         )
@@ -723,7 +761,7 @@ class InteractiveMode:
         self.console.print("\n[bold cyan]Ferramentas Externas:[/bold cyan]")
 
         # MuseScore
-        musescore_path = Prompt.ask(
+        musescore_path = self._ask_str(
             "Caminho do MuseScore (para partituras)",
             default=""
         ).strip()
@@ -731,7 +769,7 @@ class InteractiveMode:
             settings.musescore_path = musescore_path
 
         # Cookies para YouTube
-        cookie_file = Prompt.ask(
+        cookie_file = self._ask_str(
             "Arquivo de cookies para YouTube",
             default=""
         ).strip()
@@ -739,7 +777,7 @@ class InteractiveMode:
             settings.cookiefile = cookie_file
 
         # FFmpeg
-        ffmpeg_path = Prompt.ask(
+        ffmpeg_path = self._ask_str(
             "Pasta do FFmpeg",
             default=""
         ).strip()
@@ -788,18 +826,35 @@ class InteractiveMode:
                 "timestamp": time.time()
             }
 
-            with open(self.settings_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            if ORJSON_AVAILABLE:
+                with open(self.settings_cache_file, 'wb') as f:
+                    f.write(orjson.dumps(cache_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.settings_cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            self._cache_memo = (self.settings_cache_file, cache_data)
 
         except Exception as e:
             self.console.print(f"[yellow]Aviso:[/yellow] Não foi possível salvar cache: {e}")
 
     def load_settings_cache(self) -> Optional[Dict[str, Any]]:
-        """Carrega configurações do cache"""
+        """Carrega configurações do cache (o arquivo só é lido na primeira vez)"""
+        if self._cache_memo is not None and self._cache_memo[0] == self.settings_cache_file:
+            return self._cache_memo[1]
         try:
             if os.path.exists(self.settings_cache_file):
-                with open(self.settings_cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                if ORJSON_AVAILABLE:
+                    with open(self.settings_cache_file, 'rb') as f:
+                        if os.fstat(f.fileno()).st_size > _CACHE_MMAP_MIN_SIZE:
+                            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                                cache_data = orjson.loads(view)
+                        else:
+                            cache_data = orjson.loads(f.read())
+                else:
+                    with open(self.settings_cache_file, 'r', encoding='utf-8') as f:
+                        cache_data = json.load(f)
+                self._cache_memo = (self.settings_cache_file, cache_data)
+                return cache_data
         except Exception:
             pass
         return None
@@ -891,7 +946,7 @@ class InteractiveMode:
         self.console.print(jobs_table)
 
         # Confirmação final
-        if not Confirm.ask(f"\n{self.header} Continuar com essas configurações?", default=True):
+        if not self._ask_bool(f"\n{self.header} Continuar com essas configurações?", default=True):
             self.console.print(f"{self.header} [yellow]Operação cancelada pelo usuário.[/yellow]")
             sys.exit(0)
 
@@ -902,16 +957,16 @@ class InteractiveMode:
 
             # Carregar cache se disponível
             cache = self.load_settings_cache()
-            if cache and Confirm.ask(f"{self.header} Usar configurações salvas?", default=False):
+            use_cache = bool(cache) and self._ask_bool(f"{self.header} Usar configurações salvas?", default=False)
+
+            # Arquivo de entrada e pasta de saída não fazem parte do cache
+            if use_cache:
                 self._apply_cache_settings(settings, cache)
-                # Ainda precisamos do arquivo de entrada
-                self.get_input_file_enhanced(settings)
-                self.get_output_folder_enhanced(settings)
-            else:
-                # Configuração manual
-                self.get_input_file_enhanced(settings)
-                self.get_output_folder_enhanced(settings)
+            self.get_input_file_enhanced(settings)
+            self.get_output_folder_enhanced(settings)
 
+            if not use_cache:
+                # Configuração manual
                 # NOVA SEÇÃO: Seleção de Jobs de Processamento
                 self.configure_processing_jobs(settings)
 
@@ -929,8 +984,8 @@ class InteractiveMode:
                 # Opções avançadas (configurações detalhadas)
                 self.configure_advanced_options_enhanced(settings)
 
-            # Salvar configurações
-            self.save_settings_cache(settings)
+                # Salvar configurações (com o cache aceito, o arquivo já está atualizado)
+                self.save_settings_cache(settings)
 
             # Mostrar resumo
             self.display_summary(settings)
@@ -952,9 +1007,9 @@ class InteractiveMode:
         try:
             # Modelos
             if cache.get('whisper_model'):
-                settings.whisper_model = WhisperModel(cache['whisper_model'])
+                settings.whisper_model = _WHISPER_BY_VALUE[cache['whisper_model']]
             if cache.get('demucs_model'):
-                settings.demucs_model = DemucsModel(cache['demucs_model'])
+                settings.demucs_model = _DEMUCS_BY_VALUE[cache['demucs_model']]
 
             # Idioma
             settings.language = cache.get('language', 'auto')
@@ -91,6 +91,7 @@ class PerformanceOptimizer:
         # Thread para monitoramento
         self._monitoring_active = False
         self._monitoring_thread = None
+        self._monitoring_lock = threading.Lock()
     
     def _detect_system_resources(self) -> SystemResources:
         """Detectar recursos disponíveis do sistema"""
@@ -335,24 +336,27 @@ class PerformanceOptimizer:
     
     def start_monitoring(self, interval: float = 5.0):
         """Iniciar monitoramento de performance em tempo real"""
-        if self._monitoring_active:
-            return
-        
-        self._monitoring_active = True
-        self._monitoring_thread = threading.Thread(
-            target=self._monitoring_loop,
-            args=(interval,),
-            daemon=True
-        )
-        self._monitoring_thread.start()
+        # O lock evita que duas chamadas concorrentes iniciem duas threads
+        with self._monitoring_lock:
+            if self._monitoring_active:
+                return
+            
+            self._monitoring_active = True
+            self._monitoring_thread = threading.Thread(
+                target=self._monitoring_loop,
+                args=(interval,),
+                daemon=True
+            )
+            self._monitoring_thread.start()
         
         logger.info("Monitoramento de performance iniciado", module="Performance", interval=interval)
     
     def stop_monitoring(self):
         """Parar monitoramento de performance"""
-        self._monitoring_active = False
-        if self._monitoring_thread:
-            self._monitoring_thread.join(timeout=1.0)
+        with self._monitoring_lock:
+            self._monitoring_active = False
+            if self._monitoring_thread:
+                self._monitoring_thread.join(timeout=1.0)
         
         logger.info("Monitoramento de performance parado", module="Performance")
     
@@ -6,6 +6,7 @@ import re
 import json
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 
 from music21 import stream, note, duration, environment, metadata, tempo, key, meter, bar
 from modules.Midi.MidiSegment import MidiSegment
@@ -64,14 +65,18 @@ def round_to_nearest_quarter(number: float) -> float:
     return round(number * 4) / 4
 
 
+_MUSESCORE_DIR_PATTERN = re.compile(r"MuseScore\s+(\d+)")
+
+
+@lru_cache(maxsize=8)
 def find_musescore_version_in_path(path) -> int:
-    pattern = r"MuseScore\s+(\d+)"
     match = None
     try:
-        for i, data in enumerate(os.listdir(path)):
-            match = re.findall(pattern, data)
-            if match:
-                break
+        with os.scandir(path) as entries:
+            for entry in entries:
+                match = _MUSESCORE_DIR_PATTERN.findall(entry.name)
+                if match:
+                    break
     except FileNotFoundError:
         return -1
 
@@ -210,8 +215,15 @@ class SheetMusicCreator:
                             musescore_path: str,
                             filename: str,
                             media_info: MediaInfo,
-                            options: Optional[Dict[str, Any]] = None) -> Optional[str]:
-        """Create enhanced sheet music with advanced features"""
+                            options: Optional[Dict[str, Any]] = None,
+                            render: bool = True) -> Optional[str]:
+        """Create enhanced sheet music with advanced features
+
+        With render=False (or options["render"] set to False) MuseScore is not
+        invoked and the path of the MusicXML written to the cache folder is
+        returned instead of a PDF.
+        """
+        render = render and (options or {}).get("render", True)
         
         if not self.validate_sheet_data(midi_segments, media_info):
             print(f"{ULTRASINGER_HEAD} {red_highlighted('Sheet music validation failed:')}")
@@ -219,6 +231,25 @@ class SheetMusicCreator:
                 print(f"  - {error}")
             return None
         
+        if not render:
+            try:
+                s = self._create_enhanced_stream(midi_segments, media_info, options)
+                
+                # Only write the MusicXML, skipping the MuseScore PDF render
+                musicxml_path = os.path.join(cache_folder_path, f"{filename}.musicxml")
+                s.write('musicxml', fp=musicxml_path)
+                
+                self._save_sheet_metadata(midi_segments, musicxml_path, media_info, options)
+                
+                print(f"{ULTRASINGER_HEAD} {green_highlighted('MusicXML created without rendering:')} {musicxml_path}")
+                return musicxml_path
+            
+            except Exception as e:
+                song_error = f"{media_info.artist} - {media_info.title}"
+                print(f"{ULTRASINGER_HEAD} {red_highlighted('Error: Could not create sheet for')} {blue_highlighted(song_error)}")
+                print(f"\t{red_highlighted(f'Error: ->{e}')}")
+                return None
+        
         print(f"{ULTRASINGER_HEAD} Creating enhanced sheet music with {blue_highlighted('MuseScore')}")
         
         success = set_environment_variables(musescore_path)